@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
 """task 1 on pagination"""
-import csv
-from typing import List
+import threading
+from typing import Dict, Iterator, List, Sequence
+
+Snapshot = __import__('dataset_snapshot').Snapshot
+stream = __import__('stream_pages')
+secondary_index = __import__('secondary_index')
+sort_orders = __import__('sort_orders')
 
 
 def index_range(page: int, page_size: int) -> tuple:
@@ -12,28 +17,109 @@ def index_range(page: int, page_size: int) -> tuple:
 
 
 class Server:
-    """Server class for paginating a database of popular baby names."""
+    """Server class for paginating a database of popular baby names.
+
+    With `mapped=True` the CSV is memory-mapped and only the rows of each
+    requested page are parsed, instead of loading the whole file. With
+    `numpy=True` the dataset is held in NumPy arrays when NumPy is
+    installed.
+
+    Rows appended to the CSV are picked up by `refresh`, or periodically
+    by `start_watcher`, without reparsing the rest of the file.
+    """
     DATA_FILE = "Popular_Baby_Names.csv"
 
-    def __init__(self):
-        self.__dataset = None
+    def __init__(self, mapped: bool = False, numpy: bool = False):
+        self.mapped = mapped
+        self.numpy = numpy
+        self.__snapshot = None
+        self.__lock = threading.Lock()
+
+    def snapshot(self) -> Snapshot:
+        """Returns the current dataset snapshot, loading it on first use.
+        Requests read from one snapshot throughout."""
+        snapshot = self.__snapshot
+        if snapshot is None:
+            with self.__lock:
+                if self.__snapshot is None:
+                    self.__snapshot = Snapshot.load(
+                        self.DATA_FILE, self.mapped, self.numpy)
+                snapshot = self.__snapshot
+        return snapshot
+
+    def refresh(self) -> bool:
+        """Ingests the rows appended to the CSV since it was loaded and
+        publishes them in a new snapshot. Returns whether rows were added
+        or the file reloaded."""
+        with self.__lock:
+            if self.__snapshot is None:
+                return False
+            snapshot = self.__snapshot.refresh()
+            changed = snapshot is not self.__snapshot
+            self.__snapshot = snapshot
+        return changed
+
+    def start_watcher(self, interval: float = 1.0) -> threading.Event:
+        """Calls refresh every interval seconds from a daemon thread.
+        Set the returned event to stop watching."""
+        stopped = threading.Event()
+
+        def watch():
+            while not stopped.wait(interval):
+                self.refresh()
+
+        threading.Thread(target=watch, daemon=True).start()
+        return stopped
 
     def dataset(self) -> List[List]:
-        """Returns the cached dataset."""
-        if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]
-
-        return self.__dataset
-
-    def get_page(self, page: int = 1, page_size: int = 10) -> List[List]:
-        """Finds the correct indexes to paginate the dataset and
-        returns the appropriate page."""
+        """Returns the cached dataset, stored column by column or mapped."""
+        return self.snapshot().dataset
+
+    def indexes(self) -> secondary_index.SecondaryIndex:
+        """Returns the secondary indexes on year, gender and ethnicity."""
+        return self.snapshot().indexes()
+
+    def orders(self) -> sort_orders.SortOrders:
+        """Returns the sort orders, persisted next to the CSV if mapped."""
+        return self.snapshot().orders()
+
+    def filtered(self, sort_by: str = None, **filters) -> Sequence[List]:
+        """Returns the rows matching column=value filters on year, gender
+        and ethnicity, ordered by the sort_by column ("-count" for
+        descending), or the whole dataset without either."""
+        return self.snapshot().filtered(sort_by, **filters)
+
+    def aggregate(self, by: str, value: str = "count",
+                  **filters) -> Dict[str, int]:
+        """Returns the sum of the value column for each distinct value of
+        the by column over the rows matching the filters, such as the
+        total count of each name across years with aggregate("name")."""
+        assert not self.mapped, "aggregates need an in-memory dataset"
+        return self.dataset().group_sum(by, value, **filters)
+
+    def top_k(self, k: int = 10, **filters) -> List[List]:
+        """Returns the k rows with the highest count among those matching
+        the filters, such as the most popular names of a year."""
+        assert isinstance(k, int) and k > 0
+        return self.snapshot().top_k(k, **filters)
+
+    def iter_pages(self, page_size: int = 10,
+                   checkpoint: stream.Checkpoint = None
+                   ) -> Iterator[stream.Page]:
+        """Yields every page of the CSV file in order, reading one page at
+        a time, from the start or from a saved checkpoint."""
+        return stream.stream_pages(self.DATA_FILE, page_size, checkpoint)
+
+    def get_page(self, page: int = 1, page_size: int = 10,
+                 sort_by: str = None, **filters) -> List[List]:
+        """Finds the correct indexes to paginate the dataset, or the rows
+        matching the filters, in sort_by order if given, and returns the
+        appropriate page. The last page of filtered or sorted rows may be
+        partial, as the total they paginate into counts it."""
         assert isinstance(page, int) and isinstance(page_size, int)
         assert page > 0 and page_size > 0
         start, end = index_range(page, page_size)
-        dataset = self.dataset()
+        dataset = self.filtered(sort_by, **filters)
+        whole = sort_by is None and not filters
         return [] if (start >= len(dataset) or
-                end >= len(dataset)) else dataset[start:end]
+                whole and end >= len(dataset)) else dataset[start:end]
@@ -14,3 +14,11 @@ print("---")
 print(server.get_hyper(100, 3))
 print("---")
 print(server.get_hyper(3000, 100))
+print("---")
+page = 1
+while page is not None:
+    hyper = server.get_hyper(page, 100, year=2016, gender="FEMALE",
+                             ethnicity="WHITE NON HISPANIC")
+    print(hyper["page"], hyper["page_size"], hyper["prev_page"],
+          hyper["next_page"], hyper["total_pages"])
+    page = hyper["next_page"]
@@ -3,51 +3,112 @@
 Deletion-resilient hypermedia pagination
 """
 
-import csv
+import threading
 from typing import List, Dict
 
+Snapshot = __import__('dataset_snapshot').Snapshot
+live_index = __import__('live_index')
+
 
 class Server:
-    """Server class for paginating a database of popular baby names."""
+    """Server class for paginating a database of popular baby names.
+
+    With `mapped=True` the CSV is memory-mapped and only the rows of each
+    requested page are parsed, instead of loading the whole file. With
+    `numpy=True` the dataset is held in NumPy arrays when NumPy is
+    installed.
+
+    Rows appended to the CSV are picked up by `refresh`, or periodically
+    by `start_watcher`, without reparsing the rest of the file; rows
+    deleted from the indexed dataset stay deleted.
+    """
     DATA_FILE = "Popular_Baby_Names.csv"
 
-    def __init__(self):
-        self.__dataset = None
+    def __init__(self, mapped: bool = False, numpy: bool = False):
+        self.mapped = mapped
+        self.numpy = numpy
+        self.__snapshot = None
+        self.__lock = threading.Lock()
         self.__indexed_dataset = None
 
-    def dataset(self) -> List[List]:
-        """Returns the cached dataset."""
-        if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]
+    def snapshot(self) -> Snapshot:
+        """Returns the current dataset snapshot, loading it on first use.
+        Requests read from one snapshot throughout."""
+        snapshot = self.__snapshot
+        if snapshot is None:
+            with self.__lock:
+                if self.__snapshot is None:
+                    self.__snapshot = Snapshot.load(
+                        self.DATA_FILE, self.mapped, self.numpy)
+                snapshot = self.__snapshot
+        return snapshot
+
+    def refresh(self) -> bool:
+        """Ingests the rows appended to the CSV since it was loaded and
+        publishes them in a new snapshot. Returns whether rows were added
+        or the file reloaded."""
+        with self.__lock:
+            if self.__snapshot is None:
+                return False
+            snapshot = self.__snapshot.refresh()
+            changed = snapshot is not self.__snapshot
+            if self.__indexed_dataset is not None:
+                # Deletes and inserts only ever go to a built live index
+                snapshot.live_index()
+            self.__snapshot = snapshot
+        return changed
+
+    def start_watcher(self, interval: float = 1.0) -> threading.Event:
+        """Calls refresh every interval seconds from a daemon thread.
+        Set the returned event to stop watching."""
+        stopped = threading.Event()
+
+        def watch():
+            while not stopped.wait(interval):
+                self.refresh()
 
-        return self.__dataset
+        threading.Thread(target=watch, daemon=True).start()
+        return stopped
+
+    def dataset(self) -> List[List]:
+        """Returns the cached dataset, stored column by column or mapped."""
+        return self.snapshot().dataset
 
     def indexed_dataset(self) -> Dict[int, List]:
-        """Returns the dataset indexed by sorting position, starting at 0."""
-        if self.__indexed_dataset is None:
-            dataset = self.dataset()
-            truncated_dataset = dataset[:1000]
-            self.__indexed_dataset = {
-                i: dataset[i] for i in range(len(dataset))
-            }
+        """Returns the dataset indexed by sorting position, starting at 0.
+
+        Rows can be deleted or inserted like in a dict. The changes are
+        made to the live index of the current snapshot under the Server's
+        lock, so they are carried over by every later refresh.
+        """
+        self.live_index()
         return self.__indexed_dataset
 
+    def live_index(self) -> live_index.LiveIndex:
+        """Returns the live index of the current snapshot, in which the
+        live rows after a position are found without probing the deleted
+        ones."""
+        snapshot = self.snapshot()
+        if self.__indexed_dataset is None:
+            with self.__lock:
+                snapshot = self.__snapshot
+                snapshot.live_index()
+                self.__indexed_dataset = live_index.LockedIndex(
+                    lambda: self.__snapshot.live_index(), self.__lock)
+        return snapshot.live_index()
+
     def get_hyper_index(self, index: int = None, page_size: int = 10) -> Dict:
-        """Returns a dictionary with pagination information."""
-        assert index in range(len(self.indexed_dataset()))
-        next_index = index + page_size
-        data = list()
-        for i in range(index, index + page_size):
-            if not self.indexed_dataset().get(i):
-                next_index += 1
-            data.append(self.indexed_dataset().get(i))
+        """Returns the page_size live rows from index onwards, skipping
+        deleted ones, with the index to request the following page at."""
+        indexed_dataset = self.live_index()
+        assert isinstance(index, int) and isinstance(page_size, int)
+        assert 0 <= index < indexed_dataset.size and page_size > 0
+        positions = indexed_dataset.page(index, page_size)
+        next_index = positions[-1] + 1 if positions else indexed_dataset.size
 
         return {
             "index": index,
             "next_index": next_index,
-            "page_size": page_size,
-            "data": data
+            "page_size": len(positions),
+            "data": [indexed_dataset[i] for i in positions]
         }
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the columnar dataset against the list-of-lists dataset.
+
+The CSV is scaled by repeating its rows into a temporary file, then each
+representation is loaded under tracemalloc to report its load time and
+resident size, and pages are fetched at random offsets to report the
+per-page latency.
+
+Usage:
+    ./bench_columnar.py [scale] [page_size]
+"""
+
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ColumnarDataset = __import__('columnar_dataset').ColumnarDataset
+
+DATA_FILE = "Popular_Baby_Names.csv"
+
+
+def scaled_csv(scale: int) -> str:
+    """Writes the dataset repeated scale times and returns its path."""
+    with open(DATA_FILE) as f:
+        header, *body = f.readlines()
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    with os.fdopen(fd, "w") as f:
+        f.write(header)
+        for _ in range(scale):
+            f.writelines(body)
+    return path
+
+
+def load_lists(path: str) -> list:
+    """Loads the CSV the way the Server classes used to."""
+    with open(path) as f:
+        return [row for row in csv.reader(f)][1:]
+
+
+def measure(load, path: str, page_size: int, pages: int = 1000) -> tuple:
+    """Returns the load seconds, traced bytes and microseconds per page."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    dataset = load(path)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rand = random.Random(0)
+    starts = [rand.randrange(len(dataset) - page_size) for _ in range(pages)]
+    begin = time.perf_counter()
+    for i in starts:
+        dataset[i:i + page_size]
+    per_page = (time.perf_counter() - begin) / pages * 1e6
+    return elapsed, size, per_page
+
+
+def main():
+    """Prints the comparison for the scale given on the command line."""
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    path = scaled_csv(scale)
+    try:
+        print(f"{'dataset':>10} {'load s':>8} {'MiB':>8} {'us/page':>8}")
+        for name, load in (("lists", load_lists),
+                           ("columnar", ColumnarDataset.from_csv)):
+            elapsed, size, per_page = measure(load, path, page_size)
+            print(f"{name:>10} {elapsed:>8.2f} {size / 2 ** 20:>8.1f} "
+                  f"{per_page:>8.1f}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark of the mapped dataset against the columnar dataset.
+
+For copies of the CSV scaled 1x, 10x and 100x, a fresh Server fetches page
+1 in each mode and the time to that first page is reported: loading the
+columnar dataset, scanning the file to build the mapped row index (the
+first mapped start), and mapping the saved sidecar index (later starts).
+
+Usage:
+    ./bench_mapped.py [scale ...]
+"""
+
+import os
+import sys
+import time
+
+scaled_csv = __import__('bench_columnar').scaled_csv
+Server = __import__('1-simple_pagination').Server
+
+
+def first_page(path: str, mapped: bool) -> float:
+    """Returns the seconds a new Server takes to return page 1."""
+    server = Server(mapped=mapped)
+    server.DATA_FILE = path
+    start = time.perf_counter()
+    server.get_page(1, 10)
+    return time.perf_counter() - start
+
+
+def main():
+    """Prints the first-page latency for each scale."""
+    scales = [int(arg) for arg in sys.argv[1:]] or [1, 10, 100]
+    print(f"{'scale':>6} {'columnar s':>11} {'scan s':>9} {'sidecar ms':>11}")
+    for scale in scales:
+        path = scaled_csv(scale)
+        try:
+            columnar = first_page(path, False)
+            scan = first_page(path, True)
+            sidecar = first_page(path, True)
+        finally:
+            os.remove(path)
+            if os.path.exists(path + ".idx"):
+                os.remove(path + ".idx")
+        print(f"{scale:>6} {columnar:>11.3f} {scan:>9.3f} "
+              f"{sidecar * 1000:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the NumPy dataset against the pure-Python columnar dataset.
+
+Both backends load a scaled copy of the CSV and answer the same queries:
+total count per name, count per ethnicity for one year, the ids of one
+year's female rows, and a 100-row page of those ids. Only the columnar
+backend is timed when NumPy is not installed.
+
+Usage:
+    ./bench_numpy.py [scale]
+"""
+
+import os
+import sys
+import time
+
+scaled_csv = __import__('bench_columnar').scaled_csv
+numpy_dataset = __import__('numpy_dataset')
+ColumnarDataset = __import__('columnar_dataset').ColumnarDataset
+
+QUERIES = {
+    "sum/name": lambda d: d.group_sum("name"),
+    "sum/eth 2016": lambda d: d.group_sum("ethnicity", year=2016),
+    "filter": lambda d: d.filter_ids(year=2014, gender="FEMALE"),
+}
+
+
+def timed(function, *args) -> tuple:
+    """Returns the result of a call and its duration in milliseconds."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    """Prints the timings of each backend on the given scale."""
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    path = scaled_csv(scale)
+    try:
+        columnar, load_ms = timed(ColumnarDataset.from_csv, path)
+        backends = {"python": (columnar, load_ms)}
+        if numpy_dataset.np is not None:
+            dataset, convert_ms = timed(numpy_dataset.NumpyDataset, columnar)
+            backends["numpy"] = (dataset, load_ms + convert_ms)
+    finally:
+        os.remove(path)
+
+    print(f"{'backend':>8} {'load':>9} " +
+          " ".join(f"{name:>13}" for name in QUERIES) + f" {'page':>9}")
+    for name, (dataset, load_ms) in backends.items():
+        times = []
+        for query in QUERIES.values():
+            ids, elapsed = timed(query, dataset)
+            times.append(elapsed)
+        page = ids[len(ids) // 2:len(ids) // 2 + 100]
+        if hasattr(dataset, "take"):
+            _, page_ms = timed(dataset.take, page)
+        else:
+            _, page_ms = timed(lambda: [dataset[i] for i in page])
+        print(f"{name:>8} {load_ms:>7.0f}ms " +
+              " ".join(f"{ms:>11.1f}ms" for ms in times) +
+              f" {page_ms:>7.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
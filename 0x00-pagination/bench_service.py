@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Load test of the pagination service with many concurrent clients.
+
+The service is started in a child process, then every client opens one
+keep-alive connection and sends its requests for pages at random offsets
+back to back. Throughput and the p50/p99 request latency are reported once
+all clients are done.
+
+Usage:
+    ./bench_service.py [clients] [requests_per_client] [path_template]
+"""
+
+import asyncio
+import random
+import subprocess
+import sys
+import time
+
+PORT = 8765
+
+
+async def client(paths, latencies) -> None:
+    """Sends requests over one connection and records their latencies."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", PORT)
+    for path in paths:
+        start = time.perf_counter()
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+        await reader.readline()
+        length = 0
+        while True:
+            header = await reader.readline()
+            if header == b"\r\n":
+                break
+            if header.lower().startswith(b"content-length:"):
+                length = int(header.split(b":")[1])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def main(clients: int, requests: int, template: str) -> None:
+    """Runs the clients and prints the results."""
+    rand = random.Random(0)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client([template.format(page=rand.randrange(1, 1900))
+                for _ in range(requests)], latencies)
+        for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"{len(latencies)} requests from {clients} clients in "
+          f"{elapsed:.2f} s: {len(latencies) / elapsed:,.0f} req/s, "
+          f"p50 {latencies[len(latencies) // 2] * 1000:.1f} ms, "
+          f"p99 {latencies[len(latencies) * 99 // 100] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    template = (sys.argv[3] if len(sys.argv) > 3
+                else "/hyper?page={page}&page_size=10")
+    service = subprocess.Popen(
+        [sys.executable, "pagination_service.py", "127.0.0.1", str(PORT)],
+        stdout=subprocess.PIPE)
+    try:
+        service.stdout.readline()
+        asyncio.run(main(clients, requests, template))
+    finally:
+        service.terminate()
+        service.wait()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Column-wise, typed in-memory store for the baby names dataset.
+
+`ColumnarDataset` keeps each CSV column in a compact container instead of
+one list of strings per row: year, count and rank are unsigned arrays,
+gender and ethnicity are dictionary-encoded (a byte of code per row plus
+the list of distinct values), and names are interned so repeated names
+share a single string. Rows are rebuilt as lists of strings only when they
+are read, so slicing a page materializes that page and nothing else; the
+few distinct numbers are rendered once and their strings shared.
+
+The dataset behaves as a read-only sequence of rows, which lets the
+`Server` classes keep slicing it exactly as they sliced the list of lists.
+`filter_ids` and `group_sum` answer filters and aggregates from the columns
+directly; `numpy_dataset` offers the same API vectorized.
+"""
+
+import csv
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterable, Iterator, List
+
+NUMERIC = ("year", "count", "rank")
+
+
+class Dictionary:
+    """Dictionary-encoded column of repeated string values."""
+
+    def __init__(self):
+        self.codes = array('B')
+        self.values = []
+        self._code_of = {}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return list(map(self.values.__getitem__, self.codes[i]))
+        return self.values[self.codes[i]]
+
+    def code(self, value: str) -> int:
+        """Returns the code of a value, assigning the next one if new."""
+        code = self._code_of.get(value)
+        if code is None:
+            code = len(self.values)
+            if code > 0xFF and self.codes.typecode == 'B':
+                self.codes = array('H', self.codes)
+            self._code_of[value] = code
+            self.values.append(value)
+        return code
+
+    def copy(self) -> "Dictionary":
+        """Returns a copy that can be appended to independently."""
+        other = Dictionary()
+        other.codes = array(self.codes.typecode, self.codes)
+        other.values = self.values[:]
+        other._code_of = self._code_of.copy()
+        return other
+
+    def find(self, value: str) -> int:
+        """Returns the code of a value, or -1 if the column never holds it."""
+        return self._code_of.get(value, -1)
+
+    def append(self, value: str) -> None:
+        """Appends a value to the column."""
+        self.codes.append(self.code(value))
+
+
+class _Decimal(dict):
+    """Memo of the decimal strings of numbers already rendered."""
+
+    def __missing__(self, number: int) -> str:
+        text = self[number] = str(number)
+        return text
+
+
+_decimal = _Decimal()
+
+
+def _append_number(column: array, value: str) -> array:
+    """Appends a number to a column, widening it when it overflows.
+
+    Returns:
+        array: the column, which is a new array if it had to be widened.
+    """
+    try:
+        column.append(int(value))
+    except OverflowError:
+        column = array('L', column)
+        column.append(int(value))
+    return column
+
+
+def _head(f, size: int) -> Iterator[bytes]:
+    """Yields the lines of a binary file within its first size bytes."""
+    for line in f:
+        if size <= 0:
+            return
+        yield line[:size]
+        size -= len(line)
+
+
+class ColumnarDataset(Sequence):
+    """Baby names rows stored column by column.
+
+    Attributes:
+        header (List[str]): the CSV header.
+        year, count, rank (array): numeric columns, 'H' until a value
+            does not fit in 16 bits.
+        gender, ethnicity (Dictionary): categorical columns.
+        name (List[str]): interned first names.
+    """
+
+    def __init__(self, header: List[str] = None):
+        self.header = header
+        self.year = array('H')
+        self.gender = Dictionary()
+        self.ethnicity = Dictionary()
+        self.name = []
+        self.count = array('H')
+        self.rank = array('H')
+
+    @classmethod
+    def from_csv(cls, path: str, size: int = None) -> "ColumnarDataset":
+        """Loads a CSV file, skipping its header row.
+
+        Args:
+            path (str): the CSV file.
+            size (int): how many bytes of the file to load, all if None.
+        """
+        with open(path, "rb") as f:
+            lines = (line.decode() for line in
+                     (f if size is None else _head(f, size)))
+            reader = csv.reader(lines)
+            dataset = cls(next(reader, None))
+            dataset.extend(reader)
+        return dataset
+
+    def extended(self, rows: Iterable[List[str]]) -> "ColumnarDataset":
+        """Returns a copy of the dataset with rows appended, leaving this
+        one unchanged for the readers still holding it."""
+        other = ColumnarDataset(self.header)
+        other.year = array(self.year.typecode, self.year)
+        other.gender = self.gender.copy()
+        other.ethnicity = self.ethnicity.copy()
+        other.name = self.name[:]
+        other.count = array(self.count.typecode, self.count)
+        other.rank = array(self.rank.typecode, self.rank)
+        other.extend(rows)
+        return other
+
+    def append(self, row: List[str]) -> None:
+        """Appends one row given as a list of strings."""
+        year, gender, ethnicity, name, count, rank = row
+        self.year = _append_number(self.year, year)
+        self.gender.append(gender)
+        self.ethnicity.append(ethnicity)
+        self.name.append(sys.intern(name))
+        self.count = _append_number(self.count, count)
+        self.rank = _append_number(self.rank, rank)
+
+    def extend(self, rows: Iterable[List[str]]) -> None:
+        """Appends rows given as lists of strings."""
+        for row in rows:
+            self.append(row)
+
+    def row(self, i: int) -> List[str]:
+        """Returns row i in the CSV's list-of-strings form."""
+        return [_decimal[self.year[i]], self.gender[i], self.ethnicity[i],
+                self.name[i], _decimal[self.count[i]], _decimal[self.rank[i]]]
+
+    def _column(self, column: str):
+        """Returns a column's per-row keys and a function naming a key."""
+        data = getattr(self, column)
+        if isinstance(data, Dictionary):
+            return data.codes, data.values.__getitem__
+        return data, str
+
+    def filter_ids(self, **filters) -> List[int]:
+        """Returns the ids of the rows whose columns equal the filters."""
+        ids = range(len(self))
+        for column, value in filters.items():
+            data = getattr(self, column)
+            if isinstance(data, Dictionary):
+                data, value = data.codes, data.find(value)
+            elif column in NUMERIC:
+                value = int(value)
+            ids = [i for i in ids if data[i] == value]
+        return list(ids)
+
+    def group_sum(self, by: str, value: str = "count",
+                  **filters) -> Dict[str, int]:
+        """Returns the sum of a numeric column per value of another, over
+        the rows matching the filters; e.g. group_sum("name") is the total
+        count of each name across years."""
+        keys, name = self._column(by)
+        values = getattr(self, value)
+        totals = {}
+        get = totals.get
+        ids = self.filter_ids(**filters) if filters else range(len(self))
+        for i in ids:
+            key = keys[i]
+            totals[key] = get(key, 0) + values[i]
+        return {name(key): total for key, total in totals.items()}
+
+    def __len__(self) -> int:
+        return len(self.name)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            decimal = _decimal.__getitem__
+            return [list(row) for row in zip(
+                map(decimal, self.year[i]), self.gender[i], self.ethnicity[i],
+                self.name[i], map(decimal, self.count[i]),
+                map(decimal, self.rank[i]))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("dataset index out of range")
+        return self.row(i)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Opaque, signed continuation tokens for cursor pagination.
+
+A cursor packs the row a page starts at, the page size and the version of
+the dataset it was issued for, signs them with HMAC-SHA256 and encodes the
+result as URL-safe base64. Clients can only hand back cursors the server
+issued: a forged or edited cursor fails the signature check, and a cursor
+issued before the data file changed fails the version check, so neither
+can be used to reach an offset or page size the server never offered.
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import struct
+from typing import NamedTuple
+
+PAYLOAD = struct.Struct("<QI8s")
+MAC_SIZE = 16
+
+
+class InvalidCursor(ValueError):
+    """Raised for a cursor that is malformed, forged or out of date."""
+
+
+class Cursor(NamedTuple):
+    """Decoded cursor: the first row of the page and the page size."""
+    position: int
+    page_size: int
+
+
+def dataset_version(path: str) -> bytes:
+    """Returns an 8-byte version of a data file from its size and mtime."""
+    stat = os.stat(path)
+    stamp = f"{stat.st_size}:{stat.st_mtime_ns}".encode()
+    return hashlib.blake2b(stamp, digest_size=8).digest()
+
+
+class CursorCodec:
+    """Signs and verifies cursors with a secret key.
+
+    Args:
+        secret (bytes): the signing key; a random one is drawn if None, so
+            cursors are then only valid within this process.
+    """
+
+    def __init__(self, secret: bytes = None):
+        self._secret = secret or secrets.token_bytes(32)
+
+    def _mac(self, payload: bytes) -> bytes:
+        return hmac.new(self._secret, payload,
+                        hashlib.sha256).digest()[:MAC_SIZE]
+
+    def encode(self, cursor: Cursor, version: bytes) -> str:
+        """Returns the token of a cursor for a dataset version."""
+        payload = PAYLOAD.pack(cursor.position, cursor.page_size, version)
+        token = base64.urlsafe_b64encode(payload + self._mac(payload))
+        return token.rstrip(b"=").decode()
+
+    def decode(self, token: str, version: bytes) -> Cursor:
+        """Returns the cursor of a token issued for a dataset version.
+
+        Raises:
+            InvalidCursor: if the token is malformed, its signature does
+                not match or it was issued for another version.
+        """
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        except (TypeError, ValueError):
+            raise InvalidCursor("malformed cursor") from None
+        if len(raw) != PAYLOAD.size + MAC_SIZE:
+            raise InvalidCursor("malformed cursor")
+        payload, mac = raw[:PAYLOAD.size], raw[PAYLOAD.size:]
+        if not hmac.compare_digest(mac, self._mac(payload)):
+            raise InvalidCursor("cursor signature does not match")
+        position, page_size, issued_for = PAYLOAD.unpack(payload)
+        if issued_for != version:
+            raise InvalidCursor("cursor was issued for another dataset")
+        return Cursor(position, page_size)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Immutable dataset snapshots, refreshed from rows appended to the CSV.
+
+A `Snapshot` bundles the loaded dataset with the structures derived from
+it (secondary indexes, sort orders, the deletion-resilient live index),
+built when first needed. The `Server` classes keep a reference to the
+current snapshot and every request reads from the one snapshot it started
+with, so it never mixes the rows of one version with the indexes of
+another.
+
+`refresh` compares the CSV's size and modification time with the ones the
+snapshot was loaded from. When the file only grew, it parses the appended
+complete lines alone and returns a new snapshot: the dataset is copied
+with the new rows added (the mapped dataset scans only the new bytes),
+the secondary and live indexes index only the new row ids, and sort
+orders are rebuilt on their next use. The old snapshot is left untouched
+for the requests still reading it. A file that shrank is loaded afresh;
+one rewritten in place without shrinking is not detected, as the CSV is
+expected to only ever be appended to.
+
+Refreshes must not run concurrently; the Server serializes them.
+"""
+
+import csv
+import os
+from typing import List, Sequence
+
+ColumnarDataset = __import__('columnar_dataset').ColumnarDataset
+MappedCSV = __import__('mapped_csv').MappedCSV
+numpy_dataset = __import__('numpy_dataset')
+secondary_index = __import__('secondary_index')
+sort_orders = __import__('sort_orders')
+cursor_token = __import__('cursor_token')
+LiveIndex = __import__('live_index').LiveIndex
+
+BLOCK = 1 << 16
+
+
+def _complete(path: str, start: int, size: int) -> int:
+    """Returns the offset just past the last newline of a file between
+    two byte offsets, or start if there is none, reading backwards."""
+    with open(path, "rb") as f:
+        end = size
+        while end > start:
+            block = max(start, end - BLOCK)
+            f.seek(block)
+            newline = f.read(end - block).rfind(b"\n")
+            if newline >= 0:
+                return block + newline + 1
+            end = block
+    return start
+
+
+class Snapshot:
+    """One version of the dataset and its derived structures.
+
+    Attributes:
+        path (str): the CSV file.
+        dataset (Sequence[List]): the rows.
+        size (int): the bytes of the file the rows were read from.
+        stamp (tuple): the file's size and mtime when last checked.
+        version (bytes): the cursor version, kept across appends since
+            they leave every row position valid.
+    """
+
+    def __init__(self, path: str, dataset: Sequence, size: int,
+                 stamp: tuple, version: bytes, mapped: bool = False,
+                 numpy: bool = False):
+        self.path = path
+        self.dataset = dataset
+        self.size = size
+        self.stamp = stamp
+        self.version = version
+        self.mapped = mapped
+        self.numpy = numpy
+        self._indexes = None
+        self._orders = None
+        self._live_index = None
+
+    @classmethod
+    def load(cls, path: str, mapped: bool = False,
+             numpy: bool = False) -> "Snapshot":
+        """Loads the complete lines of a CSV file."""
+        stat = os.stat(path)
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        size = _complete(path, 0, stat.st_size)
+        if mapped:
+            dataset = MappedCSV(path, size=size)
+        elif numpy:
+            dataset = numpy_dataset.load(path, size)
+        else:
+            dataset = ColumnarDataset.from_csv(path, size)
+        return cls(path, dataset, size, stamp,
+                   cursor_token.dataset_version(path), mapped, numpy)
+
+    def refresh(self) -> "Snapshot":
+        """Returns the snapshot of the file as it is now: this one if it
+        did not change, or one with the appended rows added."""
+        stat = os.stat(self.path)
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        if stamp == self.stamp:
+            return self
+        if stat.st_size < self.size:
+            return Snapshot.load(self.path, self.mapped, self.numpy)
+        size = _complete(self.path, self.size, stat.st_size)
+        if size == self.size:
+            return self
+        if self.mapped:
+            dataset = MappedCSV(self.path, size=size, previous=self.dataset)
+        else:
+            with open(self.path, "rb") as f:
+                f.seek(self.size)
+                tail = f.read(size - self.size)
+            rows = list(csv.reader(tail.decode().splitlines()))
+            dataset = self.dataset.extended(rows)
+        snapshot = Snapshot(self.path, dataset, size, stamp, self.version,
+                            self.mapped, self.numpy)
+        if self._indexes is not None:
+            snapshot._indexes = self._indexes.extended(dataset)
+        if self._live_index is not None:
+            snapshot._live_index = self._live_index.extended(dataset)
+        return snapshot
+
+    def indexes(self) -> secondary_index.SecondaryIndex:
+        """Returns the secondary indexes on year, gender and ethnicity."""
+        if self._indexes is None:
+            self._indexes = secondary_index.SecondaryIndex(self.dataset)
+        return self._indexes
+
+    def orders(self) -> sort_orders.SortOrders:
+        """Returns the sort orders, persisted next to the CSV if mapped."""
+        if self._orders is None:
+            self._orders = sort_orders.SortOrders(
+                self.dataset, self.path if self.mapped else None)
+        return self._orders
+
+    def live_index(self) -> LiveIndex:
+        """Returns the deletion-resilient index of the rows."""
+        if self._live_index is None:
+            self._live_index = LiveIndex(self.dataset)
+        return self._live_index
+
+    def filtered(self, sort_by: str = None, **filters) -> Sequence[List]:
+        """Returns the rows matching column=value filters on year, gender
+        and ethnicity, ordered by the sort_by column ("-count" for
+        descending), or the whole dataset without either."""
+        if not filters and sort_by is None:
+            return self.dataset
+        ids = self.indexes().match(**filters) if filters else None
+        if sort_by is not None:
+            ids = (self.orders().order(sort_by) if ids is None
+                   else self.orders().sort(ids, sort_by))
+        return secondary_index.FilteredView(self.dataset, ids)
+
+    def top_k(self, k: int, **filters) -> List[List]:
+        """Returns the k rows with the highest count among those matching
+        the filters."""
+        ids = self.indexes().match(**filters) if filters else None
+        return self.orders().top_k(k, ids)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Deletion-resilient index over dataset rows.
+
+`LiveIndex` is the `{position: row}` mapping the deletion-resilient Server
+pages through, without copying the rows into a dict: it reads them from
+the dataset and keeps one live flag per position, plus the rows inserted
+or replaced since. The flags are summed in a Fenwick tree, so the number
+of live rows before a position and the position of the k-th live row are
+both found in O(log n). A page from an index selects its first live row
+in O(log n), then finds the following ones by scanning the live flags,
+which `bytearray.find` does at C speed over deleted runs. Deleting or
+inserting a row is O(log n) as well.
+
+`LockedIndex` is the mapping a Server hands out: it always reads the live
+index of the Server's current snapshot, and applies deletes and inserts to
+it while holding the Server's lock, which refreshes hold too, so a change
+is never made to an index that a refresh is copying.
+"""
+
+from collections.abc import MutableMapping
+from typing import Callable, Dict, Iterator, List, Sequence
+
+
+class LiveIndex(MutableMapping):
+    """Mapping of live positions to rows, ordered by position.
+
+    Args:
+        dataset (Sequence[List]): the rows, all live at first.
+    """
+
+    def __init__(self, dataset: Sequence[List]):
+        self._dataset = dataset
+        self._rows: Dict[int, List] = {}
+        size = len(dataset)
+        self._live = bytearray(b"\x01") * size
+        self._count = size
+        # A Fenwick tree over all-ones flags: node i covers lowbit(i) rows.
+        self._tree = [i & -i for i in range(size + 1)]
+
+    def _add(self, position: int, delta: int) -> None:
+        """Adds delta to the live flag sums covering a position."""
+        i = position + 1
+        tree = self._tree
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _grow(self, size: int) -> None:
+        """Extends the positions up to size with deleted slots."""
+        tree = self._tree
+        for i in range(len(tree), size + 1):
+            # Node i sums the flags of (i - lowbit(i), i]; the new flag is 0.
+            tree.append(self.rank(i - 1) - self.rank(i - (i & -i)))
+        self._live.extend(bytes(size - len(self._live)))
+
+    def extended(self, dataset: Sequence[List]) -> "LiveIndex":
+        """Returns a copy indexing a dataset made of this one's rows
+        followed by new ones, which are live. This index is left unchanged.
+
+        Positions past the end of the old dataset hold rows inserted into
+        the index rather than read from it; they move past the end of the
+        new dataset, in the same order, so the new rows take the positions
+        they have in the dataset and no row is hidden.
+        """
+        other = object.__new__(LiveIndex)
+        other._dataset = dataset
+        old, added = len(self._dataset), len(dataset) - len(self._dataset)
+        other._count = self._count + added
+        if self.size == old:
+            other._rows = self._rows.copy()
+            other._live = self._live[:]
+            other._tree = self._tree[:]
+            for position in range(old, len(dataset)):
+                i = position + 1
+                # The new node sums (i - lowbit(i), i], ending with a live
+                # flag.
+                other._tree.append(1 + other.rank(position) -
+                                   other.rank(i - (i & -i)))
+                other._live.append(1)
+            return other
+        other._rows = {position + added if position >= old else position: row
+                       for position, row in self._rows.items()}
+        other._live = (self._live[:old] + b"\x01" * added +
+                       self._live[old:])
+        # Every position moved past the inserted ones: build the tree anew,
+        # adding each node's sum into its parent in one linear pass.
+        tree = other._tree = [0]
+        tree.extend(other._live)
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        return other
+
+    def rank(self, position: int) -> int:
+        """Returns the number of live rows before a position."""
+        i = min(position, len(self._live))
+        total = 0
+        tree = self._tree
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def select(self, k: int) -> int:
+        """Returns the position of the live row with rank k (0-based)."""
+        assert 0 <= k < self._count
+        tree = self._tree
+        position = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            nxt = position + step
+            if nxt < len(tree) and tree[nxt] <= k:
+                position = nxt
+                k -= tree[nxt]
+            step >>= 1
+        return position
+
+    def page(self, index: int, page_size: int) -> List[int]:
+        """Returns the positions of up to page_size live rows from index."""
+        first = self.rank(index)
+        if first >= self._count:
+            return []
+        position = self.select(first)
+        positions = [position]
+        live = self._live
+        while len(positions) < page_size:
+            position = live.find(1, position + 1)
+            if position < 0:
+                break
+            positions.append(position)
+        return positions
+
+    @property
+    def size(self) -> int:
+        """Number of positions, live or deleted."""
+        return len(self._live)
+
+    def __getitem__(self, position: int) -> List:
+        if not (isinstance(position, int) and
+                0 <= position < len(self._live) and self._live[position]):
+            raise KeyError(position)
+        row = self._rows.get(position)
+        return self._dataset[position] if row is None else row
+
+    def __setitem__(self, position: int, row: List) -> None:
+        assert isinstance(position, int) and position >= 0
+        if position >= len(self._live):
+            self._grow(position + 1)
+        self._rows[position] = row
+        if not self._live[position]:
+            self._live[position] = 1
+            self._count += 1
+            self._add(position, 1)
+
+    def __delitem__(self, position: int) -> None:
+        self[position]
+        self._live[position] = 0
+        self._count -= 1
+        self._add(position, -1)
+        self._rows.pop(position, None)
+
+    def __iter__(self) -> Iterator[int]:
+        live = self._live
+        position = live.find(1)
+        while position >= 0:
+            yield position
+            position = live.find(1, position + 1)
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class LockedIndex(MutableMapping):
+    """Mapping over the current LiveIndex, changed under a lock.
+
+    Args:
+        current (Callable[[], LiveIndex]): returns the current live index.
+        lock: held by the writers of the current live index.
+    """
+
+    def __init__(self, current: Callable[[], LiveIndex], lock):
+        self._current = current
+        self._lock = lock
+
+    def __getitem__(self, position: int) -> List:
+        return self._current()[position]
+
+    def __setitem__(self, position: int, row: List) -> None:
+        with self._lock:
+            self._current()[position] = row
+
+    def __delitem__(self, position: int) -> None:
+        with self._lock:
+            del self._current()[position]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._current())
+
+    def __len__(self) -> int:
+        return len(self._current())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped CSV file addressed through a row-offset index.
+
+`MappedCSV` maps the file instead of reading it and keeps only the byte
+offset at which each row starts, so slicing a page decodes and parses the
+bytes of that page and nothing else. The offsets are found by one scan of
+the file and saved next to it in a sidecar file (`<csv>.idx`) stamped with
+the CSV's size and modification time; later instances map the sidecar
+instead of scanning, which makes opening the dataset cost the same whatever
+its size. A stale or unreadable sidecar is rebuilt.
+
+The index assumes one record per line, which holds for the baby names
+dataset: no field is quoted, so no field contains a newline.
+"""
+
+import csv
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Sequence
+from typing import List
+
+MAGIC = b"CSVIDX1\0"
+HEADER = struct.Struct("<8sQQ")
+
+
+def _scan(data, pos: int = None, offsets: array = None) -> array:
+    """Returns the start offset of every row after the header, or of every
+    row from pos onwards appended to offsets.
+
+    The offset of the end of the file is appended, so row i spans
+    offsets[i]:offsets[i + 1].
+    """
+    offsets = array('Q') if offsets is None else offsets
+    size = len(data)
+    if pos is None:
+        header_end = data.find(b"\n")
+        pos = size if header_end < 0 else header_end + 1
+    find = data.find
+    append = offsets.append
+    while pos < size:
+        append(pos)
+        end = find(b"\n", pos)
+        pos = size if end < 0 else end + 1
+    append(size)
+    return offsets
+
+
+class MappedCSV(Sequence):
+    """Read-only sequence of the rows of a memory-mapped CSV file.
+
+    Args:
+        path (str): the CSV file, whose first line is a header.
+        index_path (str): the sidecar file, `<path>.idx` by default.
+        size (int): how many bytes of the file to map, all if None.
+        previous (MappedCSV): an earlier mapping of a shorter version of
+            the same file, whose offsets are reused so only the appended
+            bytes are scanned.
+    """
+
+    def __init__(self, path: str, index_path: str = None, size: int = None,
+                 previous: "MappedCSV" = None):
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            size = stat.st_size if size is None else size
+            self._stamp = (size, stat.st_mtime_ns)
+            self._map = (mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+                         if size else b"")
+        self._index_map = None
+        self._offsets = self._load_index()
+        if self._offsets is None:
+            if previous is not None and 0 < previous.size <= size:
+                offsets = array('Q')
+                offsets.frombytes(previous._offsets[:-1].tobytes())
+                self._offsets = _scan(self._map, previous.size, offsets)
+            else:
+                self._offsets = _scan(self._map)
+            self._save_index()
+
+    @property
+    def size(self) -> int:
+        """Number of bytes of the file mapped."""
+        return self._stamp[0]
+
+    def _load_index(self):
+        """Maps the sidecar index, or returns None if it is stale."""
+        try:
+            with open(self.index_path, "rb") as f:
+                index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(index_map) < HEADER.size or \
+                HEADER.unpack_from(index_map) != (MAGIC, *self._stamp):
+            index_map.close()
+            return None
+        self._index_map = index_map
+        return memoryview(index_map)[HEADER.size:].cast('Q')
+
+    def _save_index(self) -> None:
+        """Writes the sidecar index, leaving it out if the write fails."""
+        tmp = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(HEADER.pack(MAGIC, *self._stamp))
+                self._offsets.tofile(f)
+            os.replace(tmp, self.index_path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def header(self) -> List[str]:
+        """Returns the parsed header row."""
+        end = self._offsets[0] if len(self._offsets) > 1 else len(self._map)
+        return next(csv.reader([self._map[:end].decode()]), [])
+
+    def close(self) -> None:
+        """Unmaps the file and its index."""
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        if self._index_map is not None:
+            self._index_map.close()
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            if step != 1:
+                return [self[j] for j in range(start, stop, step)]
+            if start >= stop:
+                return []
+            offsets = self._offsets
+            chunk = self._map[offsets[start]:offsets[stop]]
+            return list(csv.reader(chunk.decode().splitlines()))
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("dataset index out of range")
+        return self[i:i + 1][0]
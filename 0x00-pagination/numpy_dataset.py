@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+NumPy-backed dataset for vectorized aggregation and pagination.
+
+`NumpyDataset` holds year, count and rank as `int32` arrays and codes the
+gender, ethnicity and name columns, each as an integer array indexing its
+list of distinct values. Filters are boolean masks, `group_sum` is a
+`bincount` over the group codes, and rows are materialized by fancy
+indexing every column with the same slice or id array.
+
+NumPy is optional: `load` returns a `NumpyDataset` when it is installed
+and the pure-Python `ColumnarDataset`, which offers the same `filter_ids`
+and `group_sum` API, when it is not.
+"""
+
+from collections.abc import Sequence
+from typing import Dict, List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ColumnarDataset = __import__('columnar_dataset').ColumnarDataset
+
+NUMERIC = ("year", "count", "rank")
+
+
+def load(path: str, size: int = None):
+    """Loads a CSV file, or its first size bytes, as a NumpyDataset, or as
+    a ColumnarDataset if NumPy is not installed."""
+    columnar = ColumnarDataset.from_csv(path, size)
+    return NumpyDataset(columnar) if np is not None else columnar
+
+
+class NumpyDataset(Sequence):
+    """Baby names rows stored in NumPy arrays.
+
+    Args:
+        columnar (ColumnarDataset): the rows to convert.
+    """
+
+    def __init__(self, columnar: ColumnarDataset):
+        if np is None:
+            raise ImportError("NumpyDataset requires numpy")
+        self.header = columnar.header
+        self.numbers = {column: np.asarray(getattr(columnar, column),
+                                           dtype=np.int32)
+                        for column in NUMERIC}
+        self.codes = {}
+        self.values = {}
+        self._code_of = {}
+        for column in ("gender", "ethnicity", "name"):
+            self._encode(column, getattr(columnar, column))
+
+    def _encode(self, column: str, strings: Sequence[str]) -> None:
+        """Appends the codes of strings to a categorical column, adding the
+        values it did not hold yet."""
+        code_of = self._code_of.setdefault(column, {})
+        codes = np.fromiter((code_of.setdefault(value, len(code_of))
+                             for value in strings), dtype=np.int32,
+                            count=len(strings))
+        self.codes[column] = (np.concatenate((self.codes[column], codes))
+                              if column in self.codes else codes)
+        self.values[column] = np.array(list(code_of), dtype=object)
+
+    def extended(self, rows: List[List[str]]) -> "NumpyDataset":
+        """Returns a copy of the dataset with rows appended, leaving this
+        one unchanged for the readers still holding it."""
+        other = object.__new__(NumpyDataset)
+        other.header = self.header
+        columns = list(zip(*rows)) or [()] * 6
+        other.numbers = {
+            column: np.concatenate((self.numbers[column], np.array(
+                columns[position], dtype=np.int32)))
+            for column, position in (("year", 0), ("count", 4), ("rank", 5))}
+        other.codes = dict(self.codes)
+        other.values = dict(self.values)
+        other._code_of = {column: code_of.copy()
+                          for column, code_of in self._code_of.items()}
+        for column, position in (("gender", 1), ("ethnicity", 2),
+                                 ("name", 3)):
+            other._encode(column, columns[position])
+        return other
+
+    def __len__(self) -> int:
+        return len(self.codes["name"])
+
+    def take(self, index) -> List[List]:
+        """Returns the rows at a slice or an array of row ids, as lists of
+        strings like the CSV's."""
+        numbers, codes, values = self.numbers, self.codes, self.values
+
+        def strings(column):
+            if column in numbers:
+                return map(str, numbers[column][index].tolist())
+            return values[column][codes[column][index]].tolist()
+
+        return [list(row) for row in zip(
+            strings("year"), strings("gender"), strings("ethnicity"),
+            strings("name"), strings("count"), strings("rank"))]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.take(i)
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("dataset index out of range")
+        return self.take(slice(i, i + 1))[0]
+
+    def mask(self, **filters):
+        """Returns the boolean mask of the rows equal to every filter."""
+        mask = np.ones(len(self), dtype=bool)
+        for column, value in filters.items():
+            if column in self.numbers:
+                mask &= self.numbers[column] == int(value)
+            else:
+                code = self._code_of[column].get(value, -1)
+                mask &= self.codes[column] == code
+        return mask
+
+    def filter_ids(self, **filters):
+        """Returns the ids of the rows whose columns equal the filters."""
+        return np.flatnonzero(self.mask(**filters))
+
+    def group_sum(self, by: str, value: str = "count",
+                  **filters) -> Dict[str, int]:
+        """Returns the sum of a numeric column per value of another, over
+        the rows matching the filters."""
+        values = self.numbers[value].astype(np.int64)
+        if by in self.numbers:
+            keys, groups = np.unique(self.numbers[by], return_inverse=True)
+            names = [str(key) for key in keys.tolist()]
+        else:
+            groups, names = self.codes[by], self.values[by]
+        if filters:
+            mask = self.mask(**filters)
+            groups, values = groups[mask], values[mask]
+        sums = np.bincount(groups, weights=values, minlength=len(names))
+        present = np.bincount(groups, minlength=len(names)) > 0
+        return {names[group]: int(sums[group])
+                for group in np.flatnonzero(present).tolist()}
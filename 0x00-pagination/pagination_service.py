@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Asyncio pagination service over the baby names Servers.
+
+`AsyncServer` exposes `get_page`, `get_hyper`, `get_cursor` and
+`get_hyper_index` as coroutines. The dataset is loaded in a thread
+executor the first time it is needed, and concurrent first requests all
+await that one load instead of each parsing the CSV. Afterwards plain
+pages are served inline on the event loop, since slicing a page is
+cheaper than a thread hop, while filtered or sorted requests, which may
+build an index on first use, run in the executor. Every request is bounded
+by a timeout; a request that times out does not cancel a load other
+requests are waiting for.
+
+`serve` puts a minimal HTTP/1.1 front on it, built on `asyncio.start_server`
+with keep-alive connections and JSON responses:
+
+    GET /page?page=1&page_size=10[&sort_by=-count][&year=2016...]
+    GET /hyper?page=1&page_size=10[&sort_by=...][&gender=FEMALE...]
+    GET /cursor?page_size=10  then  GET /cursor?cursor=<next_cursor>
+    GET /hyper_index?index=0&page_size=10
+
+Invalid parameters, cursors or request lines answer 400, timeouts 504 and
+any other failure, such as an unreadable data file, 500.
+
+Usage:
+    ./pagination_service.py [host] [port]
+"""
+
+import asyncio
+import json
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List
+from urllib.parse import parse_qsl, urlsplit
+
+HyperServer = __import__('2-hypermedia_pagination').Server
+DeletionServer = __import__('3-hypermedia_del_pagination').Server
+InvalidCursor = __import__('cursor_token').InvalidCursor
+
+INTEGERS = ("page", "page_size", "index")
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 500: "Internal Server Error",
+           504: "Gateway Timeout"}
+
+
+class AsyncServer:
+    """Coroutine front for the hypermedia and deletion-resilient Servers.
+
+    Args:
+        hyper: the hypermedia Server, a new one by default.
+        deletion: the deletion-resilient Server, a new one by default.
+        timeout (float): seconds a request may take before it fails.
+        executor: runs loads and index builds, a single thread by default.
+    """
+
+    def __init__(self, hyper=None, deletion=None, timeout: float = 5.0,
+                 executor=None):
+        self.hyper = hyper or HyperServer()
+        self.deletion = deletion or DeletionServer()
+        self.timeout = timeout
+        self.executor = executor or ThreadPoolExecutor(1)
+        self._loads: Dict[object, asyncio.Future] = {}
+
+    async def _ready(self, server) -> None:
+        """Waits until a Server's dataset is loaded, loading it once.
+
+        The deletion-resilient Server also builds its live index then.
+        """
+        load = self._loads.get(server)
+        if load is None:
+            prepare = (server.indexed_dataset if server is self.deletion
+                       else server.snapshot)
+            loop = asyncio.get_running_loop()
+            load = self._loads[server] = loop.run_in_executor(self.executor,
+                                                              prepare)
+        try:
+            await asyncio.shield(load)
+        except Exception:
+            if self._loads.get(server) is load and load.done():
+                del self._loads[server]
+            raise
+
+    async def _call(self, server, method, *args, inline: bool = True,
+                    **kwargs):
+        """Runs a Server method once its dataset is loaded, within the
+        timeout, on the loop or in the executor."""
+        async def call():
+            await self._ready(server)
+            if inline:
+                return method(*args, **kwargs)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, partial(method, *args, **kwargs))
+
+        return await asyncio.wait_for(call(), self.timeout)
+
+    async def get_page(self, page: int = 1, page_size: int = 10,
+                       sort_by: str = None, **filters) -> List[List]:
+        """Returns a page of rows, as Server.get_page."""
+        return await self._call(
+            self.hyper, self.hyper.get_page, page, page_size, sort_by,
+            inline=not (sort_by or filters), **filters)
+
+    async def get_hyper(self, page: int = 1, page_size: int = 10,
+                        sort_by: str = None, **filters) -> dict:
+        """Returns a hypermedia page, as Server.get_hyper."""
+        return await self._call(
+            self.hyper, self.hyper.get_hyper, page, page_size, sort_by,
+            inline=not (sort_by or filters), **filters)
+
+    async def get_cursor(self, cursor: str = None,
+                         page_size: int = 10) -> dict:
+        """Returns the page a cursor points to, as Server.get_cursor."""
+        return await self._call(self.hyper, self.hyper.get_cursor, cursor,
+                                page_size)
+
+    async def get_hyper_index(self, index: int = None,
+                              page_size: int = 10) -> dict:
+        """Returns the live rows from an index, as Server.get_hyper_index."""
+        return await self._call(self.deletion, self.deletion.get_hyper_index,
+                                index, page_size)
+
+    async def dispatch(self, target: str) -> tuple:
+        """Answers a GET request target.
+
+        Returns:
+            tuple: the HTTP status and the JSON-serializable body.
+        """
+        url = urlsplit(target)
+        routes = {"/page": self.get_page, "/hyper": self.get_hyper,
+                  "/cursor": self.get_cursor,
+                  "/hyper_index": self.get_hyper_index}
+        route = routes.get(url.path)
+        if route is None:
+            return 404, {"error": "unknown path"}
+        params = dict(parse_qsl(url.query))
+        try:
+            for name in INTEGERS:
+                if name in params:
+                    params[name] = int(params[name])
+            return 200, await route(**params)
+        except asyncio.TimeoutError:
+            return 504, {"error": "request timed out"}
+        except InvalidCursor as e:
+            return 400, {"error": str(e)}
+        except (AssertionError, TypeError, ValueError, KeyError):
+            return 400, {"error": "invalid parameters"}
+        except Exception:
+            traceback.print_exc()
+            return 500, {"error": "internal error"}
+
+    async def handle(self, reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter) -> None:
+        """Serves the HTTP requests of one connection until it closes."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                request = line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if not header.strip():
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = headers.get("content-length", "0")
+                if len(request) != 3 or not length.isdigit():
+                    # The request cannot be delimited: answer, then close
+                    self._respond(writer, 400, {"error": "malformed request"},
+                                  False)
+                    await writer.drain()
+                    break
+                method, target, version = request
+                if int(length):
+                    await reader.readexactly(int(length))
+                if method == "GET":
+                    status, body = await self.dispatch(target)
+                else:
+                    status, body = 405, {"error": "only GET is served"}
+                keep_alive = (version == "HTTP/1.1" and
+                              headers.get("connection", "").lower() != "close")
+                self._respond(writer, status, body, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _respond(writer: asyncio.StreamWriter, status: int, body,
+                 keep_alive: bool) -> None:
+        """Writes a JSON response."""
+        payload = json.dumps(body).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"
+            f"\r\n\r\n".encode() + payload)
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080,
+                    backlog: int = 4096) -> asyncio.AbstractServer:
+        """Starts the HTTP front and returns the listening server."""
+        return await asyncio.start_server(self.handle, host, port,
+                                          backlog=backlog)
+
+
+async def main(host: str, port: int) -> None:
+    """Serves until interrupted."""
+    server = await AsyncServer().serve(host, port)
+    print(f"serving on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else "127.0.0.1",
+                         int(sys.argv[2]) if len(sys.argv) > 2 else 8080))
+    except KeyboardInterrupt:
+        pass
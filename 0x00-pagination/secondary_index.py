@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Secondary indexes for filtering the baby names dataset.
+
+`SecondaryIndex` maps every value of the year, gender and ethnicity columns
+to the sorted array of the row ids holding it, built in one pass over the
+dataset. A filter on one column is a lookup; a filter on several columns
+intersects their arrays once and keeps the result, since the columns only
+combine into a few dozen filters. A filter on a value no row holds is not
+kept, so arbitrary values cannot grow the memo. `FilteredView` then
+presents the matching rows as a sequence, so a page of them is sliced out
+of the id array and only those rows are read (in one fancy-indexing `take`
+when the dataset has one), and its length gives the filtered total.
+"""
+
+from array import array
+from collections.abc import Sequence
+from typing import Dict, List, Tuple
+
+COLUMNS = {"year": 0, "gender": 1, "ethnicity": 2}
+CHUNK = 10000
+NO_MATCH = array('I')
+
+
+class SecondaryIndex:
+    """Row ids by value for each filterable column.
+
+    Args:
+        dataset (Sequence[List]): the rows to index.
+    """
+
+    def __init__(self, dataset: Sequence):
+        self.dataset = dataset
+        self.columns: Dict[str, Dict[str, array]] = {
+            column: {} for column in COLUMNS}
+        self._matches: Dict[Tuple, array] = {}
+        self._add(0)
+
+    def _add(self, first: int) -> None:
+        """Indexes the rows of the dataset from row id first onwards."""
+        dataset = self.dataset
+        for start in range(first, len(dataset), CHUNK):
+            for row_id, row in enumerate(dataset[start:start + CHUNK],
+                                         start):
+                for column, position in COLUMNS.items():
+                    ids = self.columns[column].get(row[position])
+                    if ids is None:
+                        ids = self.columns[column][row[position]] = array('I')
+                    ids.append(row_id)
+
+    def extended(self, dataset: Sequence) -> "SecondaryIndex":
+        """Returns the index of a dataset made of this one's rows followed
+        by new ones, indexing only the new rows and leaving this index
+        unchanged."""
+        other = object.__new__(SecondaryIndex)
+        other.dataset = dataset
+        other.columns = {column: {value: array('I', ids)
+                                  for value, ids in values.items()}
+                         for column, values in self.columns.items()}
+        other._matches = {}
+        other._add(len(self.dataset))
+        return other
+
+    def values(self, column: str) -> List[str]:
+        """Returns the distinct values of a column."""
+        return sorted(self.columns[column])
+
+    def match(self, **filters) -> array:
+        """Returns the sorted ids of the rows matching every filter.
+
+        Args:
+            **filters: column=value pairs; values are compared as strings,
+                so year=2016 and year="2016" are the same filter.
+        """
+        key = tuple(sorted((column, str(value))
+                           for column, value in filters.items()))
+        ids = self._matches.get(key)
+        if ids is None:
+            assert all(column in COLUMNS for column, _ in key)
+            if not all(value in self.columns[column] for column, value in key):
+                return NO_MATCH
+            lists = sorted((self.columns[column][value]
+                            for column, value in key), key=len)
+            if len(lists) == 1:
+                ids = lists[0]
+            else:
+                ids = array('I', sorted(set(lists[0]).intersection(
+                    *lists[1:])))
+            self._matches[key] = ids
+        return ids
+
+
+class FilteredView(Sequence):
+    """Read-only sequence of the dataset rows listed in an id array."""
+
+    def __init__(self, dataset: Sequence, ids: array):
+        self.dataset = dataset
+        self.ids = ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            take = getattr(self.dataset, "take", None)
+            if take is not None:
+                return take(self.ids[i])
+            return [self.dataset[row_id] for row_id in self.ids[i]]
+        return self.dataset[self.ids[i]]
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Precomputed sort orders and top-K queries over the baby names dataset.
+
+`SortOrders` sorts the row ids by a column once and keeps the resulting
+permutation, so a page of rows in that order is a slice of the permutation
+whatever the page number. `sort_by` names the column, prefixed with `-` for
+descending order, in which rows with equal values come in reverse file
+order. Subsets of the rows, such as the ids a filter matched, are ordered
+by each row's position in the permutation, an integer key, and the result
+is kept for the next page.
+
+Given the CSV path, the permutations are saved next to it in sidecar files
+(`<csv>.<column>.order`) stamped with the CSV's size and modification time,
+so a later instance loads them instead of sorting.
+
+`top_k` picks the k rows with the largest count with a bounded heap over
+the count column, which never sorts the full dataset. Once the count order
+has been built or loaded from its sidecar, it returns the head of that
+order, or of the matching ids sorted in it, instead.
+"""
+
+import heapq
+import os
+import struct
+from array import array
+from typing import Dict, List, Sequence, Tuple
+
+SORT_COLUMNS = {"year": (0, int), "name": (3, str), "count": (4, int),
+                "rank": (5, int)}
+MAGIC = b"CSVORD1\0"
+HEADER = struct.Struct("<8sQQ")
+CHUNK = 10000
+
+
+def _column(dataset: Sequence, column: str) -> Sequence:
+    """Returns the typed values of a column, read from the dataset's
+    numeric arrays when it keeps them, otherwise in chunks of rows."""
+    numbers = getattr(dataset, "numbers", None)
+    if numbers is not None and column in numbers:
+        return numbers[column].tolist()
+    values = getattr(dataset, column, None)
+    if isinstance(values, array):
+        return values
+    position, kind = SORT_COLUMNS[column]
+    values = []
+    for start in range(0, len(dataset), CHUNK):
+        values.extend(kind(row[position])
+                      for row in dataset[start:start + CHUNK])
+    return values
+
+
+class SortOrders:
+    """Permutations of the row ids sorted by each column, built on demand.
+
+    Args:
+        dataset (Sequence[List]): the rows.
+        path (str): the CSV file, to persist the permutations next to it.
+    """
+
+    def __init__(self, dataset: Sequence, path: str = None):
+        self.dataset = dataset
+        self.path = path
+        self._orders: Dict[str, array] = {}
+        self._values: Dict[str, Sequence] = {}
+        self._unsaved = set()
+        self._positions: Dict[str, array] = {}
+        self._sorted: Dict[Tuple[int, str], Tuple[Sequence, array]] = {}
+
+    def _stamp(self) -> bytes:
+        stat = os.stat(self.path)
+        return HEADER.pack(MAGIC, stat.st_size, stat.st_mtime_ns)
+
+    def _load(self, column: str):
+        """Returns the saved permutation of a column, or None if stale."""
+        try:
+            with open(f"{self.path}.{column}.order", "rb") as f:
+                if f.read(HEADER.size) != self._stamp():
+                    return None
+                order = array('I')
+                order.frombytes(f.read())
+        except (OSError, ValueError):
+            return None
+        return order if len(order) == len(self.dataset) else None
+
+    def _save(self, column: str, order: array) -> None:
+        """Writes a permutation next to the CSV, if it can."""
+        path = f"{self.path}.{column}.order"
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(self._stamp())
+                order.tofile(f)
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def _ascending(self, column: str) -> array:
+        """Returns the row ids in ascending column order."""
+        order = self._orders.get(column)
+        if order is None and not self._built(column):
+            values = self._column(column)
+            order = array('I', sorted(range(len(values)),
+                                      key=values.__getitem__))
+            if self.path:
+                self._save(column, order)
+            self._orders[column] = order
+        return self._orders[column]
+
+    def _built(self, column: str) -> bool:
+        """Returns whether the ascending order of a column is at hand,
+        loading it from its sidecar the first time it is asked for."""
+        if (column not in self._orders and self.path and
+                column not in self._unsaved):
+            order = self._load(column)
+            if order is None:
+                self._unsaved.add(column)
+            else:
+                self._orders[column] = order
+        return column in self._orders
+
+    def _column(self, column: str) -> Sequence:
+        """Returns the typed values of a column, read once."""
+        values = self._values.get(column)
+        if values is None:
+            values = self._values[column] = _column(self.dataset, column)
+        return values
+
+    def order(self, sort_by: str) -> array:
+        """Returns the row ids in the order sort_by names."""
+        column = sort_by.lstrip("-")
+        assert column in SORT_COLUMNS
+        if not sort_by.startswith("-"):
+            return self._ascending(column)
+        order = self._orders.get(sort_by)
+        if order is None:
+            order = self._orders[sort_by] = array(
+                'I', reversed(self._ascending(column)))
+        return order
+
+    def sort(self, ids: Sequence[int], sort_by: str) -> array:
+        """Returns a subset of the row ids in the order sort_by names.
+
+        The result is kept while ids, usually a memoized filter match, is
+        the same object.
+        """
+        key = (id(ids), sort_by)
+        cached = self._sorted.get(key)
+        if cached is not None and cached[0] is ids:
+            return cached[1]
+        positions = self._positions.get(sort_by)
+        if positions is None:
+            positions = array('I', [0]) * len(self.dataset)
+            for i, row_id in enumerate(self.order(sort_by)):
+                positions[row_id] = i
+            self._positions[sort_by] = positions
+        result = array('I', sorted(ids, key=positions.__getitem__))
+        self._sorted[key] = (ids, result)
+        return result
+
+    def top_k(self, k: int, ids: Sequence[int] = None,
+              column: str = "count") -> List[List]:
+        """Returns the k rows with the largest values in a numeric column,
+        in descending order, among ids or among all the rows.
+
+        Rows with equal values come in reverse file order, as in the
+        `-column` sort order.
+        """
+        assert SORT_COLUMNS[column][1] is int
+        sort_by = "-" + column
+        if self._built(column):
+            order = (self.order(sort_by) if ids is None
+                     else self.sort(ids, sort_by))
+            best = order[:k]
+        else:
+            values = self._column(column)
+            # nlargest keeps ties in input order: feed the last rows first
+            best = heapq.nlargest(
+                k, reversed(range(len(values)) if ids is None else ids),
+                key=values.__getitem__)
+        take = getattr(self.dataset, "take", None)
+        if take is not None:
+            return take(best)
+        return [self.dataset[row_id] for row_id in best]
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Streaming pagination over CSV files or row iterators of any size.
+
+`stream_pages` is a generator pipeline: lines are read from the file a page
+at a time, decoded, parsed and yielded, so memory stays bounded by one page
+however large the source is. Every yielded `Page` carries the `Checkpoint`
+of the page after it; saving that checkpoint and passing it back resumes
+the stream there. For a file the checkpoint holds the byte offset of the
+next row, so resuming seeks straight to it; a plain row iterator has no
+offsets and is resumed by skipping the rows already paged.
+
+Like the mapped dataset, file streaming assumes one record per line.
+"""
+
+import csv
+import json
+import os
+from itertools import islice
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Union
+
+
+class Checkpoint(NamedTuple):
+    """Position of a page in a stream: its number, first row and offset."""
+    page: int = 1
+    row: int = 0
+    offset: Optional[int] = None
+
+
+class Page(NamedTuple):
+    """One page of rows and the checkpoint resuming after it."""
+    page: int
+    data: List[List]
+    next: Checkpoint
+
+
+def save_checkpoint(path: str, checkpoint: Checkpoint) -> None:
+    """Writes a checkpoint as JSON, replacing the file atomically."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(checkpoint._asdict(), f)
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: str) -> Checkpoint:
+    """Reads a checkpoint saved by save_checkpoint."""
+    with open(path) as f:
+        return Checkpoint(**json.load(f))
+
+
+def _file_pages(path: str, page_size: int,
+                checkpoint: Checkpoint) -> Iterator[Page]:
+    """Yields the pages of a CSV file, seeking to the checkpoint."""
+    with open(path, "rb") as f:
+        if checkpoint.offset is None:
+            f.readline()
+            for _ in islice(f, checkpoint.row):
+                pass
+            offset = f.tell()
+        else:
+            offset = checkpoint.offset
+            f.seek(offset)
+        page, row = checkpoint.page, checkpoint.row
+        while True:
+            lines = list(islice(f, page_size))
+            if not lines:
+                return
+            offset += sum(map(len, lines))
+            row += len(lines)
+            data = list(csv.reader(line.decode() for line in lines))
+            yield Page(page, data, Checkpoint(page + 1, row, offset))
+            page += 1
+
+
+def _row_pages(rows: Iterable[List], page_size: int,
+               checkpoint: Checkpoint) -> Iterator[Page]:
+    """Yields the pages of a row iterator, skipping to the checkpoint."""
+    rows = iter(rows)
+    for _ in islice(rows, checkpoint.row):
+        pass
+    page, row = checkpoint.page, checkpoint.row
+    while True:
+        data = list(islice(rows, page_size))
+        if not data:
+            return
+        row += len(data)
+        yield Page(page, data, Checkpoint(page + 1, row))
+        page += 1
+
+
+def stream_pages(source: Union[str, Iterable[List]], page_size: int = 10,
+                 checkpoint: Checkpoint = None) -> Iterator[Page]:
+    """Yields the pages of a CSV file or of an iterable of rows.
+
+    Args:
+        source: path of a CSV file with a header line, or an iterable of
+            rows without one.
+        page_size (int): number of rows per page.
+        checkpoint (Checkpoint): where to resume, the first page if None.
+
+    Returns:
+        Iterator[Page]: the pages in order; the last may be short.
+    """
+    assert isinstance(page_size, int) and page_size > 0
+    checkpoint = checkpoint or Checkpoint()
+    if isinstance(source, (str, os.PathLike)):
+        return _file_pages(source, page_size, checkpoint)
+    return _row_pages(source, page_size, checkpoint)
@@ -14,19 +14,21 @@ class BasicCache(BaseCaching):
     This cache has no size limit.
     """
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """
         Add an item to the cache.
 
         Args:
             key: The key for the cache entry.
             item: The value to be stored in the cache.
+            ttl (float): Seconds the entry lives; defaults to the cache's
+            default_ttl.
 
         Notes:
             If key or item is None, this method does nothing.
         """
         if key is not None and item is not None:
-            self.cache_data[key] = item
+            self._store(key, item, self._item_size(item), ttl)
 
     def get(self, key):
         """
@@ -36,6 +38,7 @@ class BasicCache(BaseCaching):
             key: The key to look up in the cache.
 
         Returns:
-            The value associated with the key, or None if not found.
+            The value associated with the key, or None if not found or
+            expired.
         """
-        return self.cache_data.get(key)
+        return self.cache_data[key] if self._live(key) else None
@@ -6,7 +6,7 @@ items from a dictionary-based cache. When the cache reaches its maximum
 capacity, it removes the oldest item (based on insertion order).
 
 Attributes:
-    cache_data (OrderedDict): A dictionary to store cached items with
+    cache_data (dict): A dictionary to store cached items with
     FIFO behavior.
 """
 
@@ -18,31 +18,35 @@ class FIFOCache(BaseCaching):
     A caching system that inherits from BaseCaching and uses FIFO algorithm.
     """
 
-    def __init__(self):
+    def __init__(self, **kwargs):
         """
         Initialize the FIFO cache.
+
+        Args:
+            **kwargs: Capacity options forwarded to BaseCaching.
         """
-        super().__init__()
+        super().__init__(**kwargs)
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """
         Add an item to the cache using FIFO algorithm.
 
         Args:
             key: The key for the cache entry.
             item: The value to be stored in the cache.
+            ttl (float): Seconds the entry lives; defaults to the cache's
+            default_ttl.
 
         Notes:
             If key or item is None, this method does nothing.
-            If the cache size exceeds BaseCaching.MAX_ITEMS, discard the
-            oldest item.
+            Updating a cached key keeps its place in the queue.
+            If the cache exceeds its capacity, discard the oldest items.
         """
-        if key is not None and item is not None:
-            if len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-                oldest_key = next(iter(self.cache_data))
-                print(f"DISCARD: {oldest_key}")
-                del self.cache_data[oldest_key]
-            self.cache_data[key] = item
+        if key is None or item is None:
+            return
+        size = self._item_size(item)
+        if self._reserve(key, size):
+            self._store(key, item, size, ttl)
 
     def get(self, key):
         """
@@ -52,6 +56,30 @@ class FIFOCache(BaseCaching):
             key: The key to look up in the cache.
 
         Returns:
-            The value associated with the key, or None if not found.
+            The value associated with the key, or None if not found or
+            expired.
+        """
+        return self.cache_data[key] if self._live(key) else None
+
+    def get_many(self, keys):
+        """
+        Retrieve several items in a single pass over the keys.
+
+        Args:
+            keys (iterable): The keys to look up.
+
+        Returns:
+            dict: The cached items of the keys that were found.
+        """
+        if self.stats is not None or self._expires:
+            return super().get_many(keys)
+        data = self.cache_data
+        return {key: data[key] for key in keys if key in data}
+
+    def _victim(self, keep=None):
+        """
+        Return the oldest key other than `keep`.
         """
-        return self.cache_data.get(key)
+        keys = iter(self.cache_data)
+        oldest_key = next(keys)
+        return next(keys) if oldest_key == keep else oldest_key
@@ -6,13 +6,22 @@ items from a dictionary-based cache. When the cache reaches its maximum
 capacity, it removes the least frequently used item
 (based on access frequency).
 
+Keys are grouped into one bucket per access frequency and the lowest
+non-empty frequency is tracked, so finding and discarding the victim never
+scans the cache. Inside a bucket keys are kept in recency order, which breaks
+frequency ties the LRU way. Each key is tracked by a single `CacheEntry`
+node holding its frequency and its links in the bucket.
+
 Attributes:
-    cache_data (OrderedDict): A dictionary to store cached items with LFU
-    behavior.
-    keys_freq (list): A list to track the frequency of each cache key.
+    cache_data (dict): A dictionary to store cached items.
+    entries (dict): The `CacheEntry` of each cache key.
+    freq_buckets (dict): Maps a frequency to an `EntryList` of the keys with
+    that frequency, least recently used first.
+    min_freq (int): The lowest frequency currently present.
 """
 
 from base_caching import BaseCaching
+from cache_entry import CacheEntry, EntryList
 
 
 class LFUCache(BaseCaching):
@@ -20,45 +29,55 @@ class LFUCache(BaseCaching):
     A caching system that inherits from BaseCaching and uses LFU algorithm.
     """
 
-    def __init__(self):
+    def __init__(self, decay_interval=None, **kwargs):
         """
         Initialize the LFU cache.
+
+        Args:
+            decay_interval (int): Optional number of accesses after which
+            every frequency is halved, so keys that were hot long ago do not
+            stay pinned in the cache forever. Disabled by default.
+            **kwargs: Capacity options forwarded to BaseCaching.
         """
-        super().__init__()
-        self.usage_count = {}
+        super().__init__(**kwargs)
+        self.entries = {}
+        self.freq_buckets = {}
+        self.min_freq = 0
+        self.decay_interval = decay_interval
+        self._accesses = 0
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """
         Add an item to the cache using LFU algorithm.
 
         Args:
             key: The key for the cache entry.
             item: The value to be stored in the cache.
+            ttl (float): Seconds the entry lives; defaults to the cache's
+            default_ttl.
 
         Notes:
             If key or item is None, this method does nothing.
-            If the cache size exceeds BaseCaching.MAX_ITEMS, discard the least
-            frequently used item.
+            If the key is already cached, its value is replaced and it
+            counts as one more use.
+            If the cache exceeds its capacity, discard the least
+            frequently used items.
             If multiple items have the same least frequency, use LRU algorithm
             to break ties.
         """
-        if key is not None and item is not None:
-            if len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-                min_usage = min(self.usage_count.values())
-                least_frequent_keys = [k for k, v in self.usage_count.items()
-                                       if v == min_usage]
-
-                lru_key = self.usage_order.pop(0)
-                while lru_key not in least_frequent_keys:
-                    lru_key = self.usage_order.pop(0)
-
-                print(f"DISCARD: {lru_key}")
-                del self.cache_data[lru_key]
-                del self.usage_count[lru_key]
-
-            self.cache_data[key] = item
-            self.usage_order.append(key)
-            self.usage_count[key] = self.usage_count.get(key, 0) + 1
+        if key is None or item is None:
+            return
+        size = self._item_size(item)
+        if key in self.cache_data:
+            self._touch(key)
+        if not self._reserve(key, size):
+            return
+        if key not in self.cache_data:
+            entry = self.entries[key] = CacheEntry(key)
+            self._bucket(1).append(entry)
+            self.min_freq = 1
+            self._maybe_decay()
+        self._store(key, item, size, ttl)
 
     def get(self, key):
         """
@@ -68,9 +87,98 @@ class LFUCache(BaseCaching):
             key: The key to look up in the cache.
 
         Returns:
-            The value associated with the key, or None if not found.
+            The value associated with the key, or None if not found or
+            expired.
         """
-        if key in self.cache_data:
-            self.usage_count[key] += 1
-            return self.cache_data[key]
-        return None
+        if key is None or not self._live(key):
+            return None
+        self._touch(key)
+        return self.cache_data[key]
+
+    def _bucket(self, freq):
+        """
+        Return the list of keys with a frequency, creating it if needed.
+        """
+        bucket = self.freq_buckets.get(freq)
+        if bucket is None:
+            bucket = self.freq_buckets[freq] = EntryList()
+        return bucket
+
+    def _touch(self, key):
+        """
+        Move a key from its frequency bucket to the next one up.
+
+        Args:
+            key: A key currently in the cache.
+        """
+        entry = self.entries[key]
+        bucket = self.freq_buckets[entry.freq]
+        bucket.remove(entry)
+        if not bucket:
+            del self.freq_buckets[entry.freq]
+            if self.min_freq == entry.freq:
+                self.min_freq = entry.freq + 1
+        entry.freq += 1
+        self._bucket(entry.freq).append(entry)
+        self._maybe_decay()
+
+    def _victim(self, keep=None):
+        """
+        Return the least frequently used key other than `keep`.
+        """
+        if self.min_freq not in self.freq_buckets:
+            self.min_freq = min(self.freq_buckets)
+        for entry in self.freq_buckets[self.min_freq]:
+            if entry.key != keep:
+                return entry.key
+        # Only `keep` has the lowest frequency
+        next_freq = min(f for f in self.freq_buckets if f > self.min_freq)
+        return next(iter(self.freq_buckets[next_freq])).key
+
+    def _forget(self, key):
+        """
+        Remove a discarded key from its frequency bucket.
+        """
+        entry = self.entries.pop(key)
+        bucket = self.freq_buckets[entry.freq]
+        bucket.remove(entry)
+        if not bucket:
+            del self.freq_buckets[entry.freq]
+
+    def _snapshot_entries(self):
+        """
+        Yield keys with their frequency, bucket by bucket, LRU first.
+        """
+        for freq in sorted(self.freq_buckets):
+            for entry in self.freq_buckets[freq]:
+                yield entry.key, freq
+
+    def _restore_entry(self, key, meta):
+        """
+        Append a restored key to the bucket of its saved frequency.
+        """
+        entry = self.entries[key] = CacheEntry(key, meta or 1)
+        self._bucket(entry.freq).append(entry)
+        if not self.min_freq or entry.freq < self.min_freq:
+            self.min_freq = entry.freq
+
+    def _maybe_decay(self):
+        """
+        Halve every frequency once `decay_interval` accesses have passed.
+
+        Buckets are merged from the lowest frequency up, so among keys that
+        end up with the same frequency, the ones that were used less are
+        discarded first. The rebuild is linear in the cache size but only
+        runs once per interval.
+        """
+        self._accesses += 1
+        if not self.decay_interval or self._accesses % self.decay_interval:
+            return
+        buckets = self.freq_buckets
+        self.freq_buckets = {}
+        for freq in sorted(buckets):
+            for entry in buckets[freq]:
+                buckets[freq].remove(entry)
+                entry.freq = max(1, freq // 2)
+                self._bucket(entry.freq).append(entry)
+        self.min_freq = min(self.freq_buckets, default=0)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""An Adaptive Replacement Cache (ARC) caching module.
+
+This module defines an `ARCCache` class that allows storing and retrieving
+items from a dictionary-based cache. Cached keys are split between a list
+of keys seen once recently (`t1`) and a list of keys seen at least twice
+(`t2`). The keys discarded from each list are remembered, without their
+values, in the ghost lists `b1` and `b2`. A hit in a ghost list tells
+which side was evicted too early and moves the target size `p` of `t1`
+accordingly, so the cache adapts between recency and frequency on its own.
+
+A sequential scan only ever touches `t1`, which keeps the frequently used
+keys of `t2` from being flushed.
+
+Attributes:
+    cache_data (dict): A dictionary to store cached items.
+    t1 (OrderedDict): Cached keys used once, least recently used first.
+    t2 (OrderedDict): Cached keys used more than once, LRU first.
+    b1 (OrderedDict): Ghost keys recently discarded from `t1`.
+    b2 (OrderedDict): Ghost keys recently discarded from `t2`.
+    p (float): The adaptive target size of `t1`.
+"""
+
+from collections import OrderedDict
+
+from base_caching import BaseCaching
+
+
+class ARCCache(BaseCaching):
+    """
+    A caching system that inherits from BaseCaching and uses ARC algorithm.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        Initialize the ARC cache.
+
+        Args:
+            **kwargs: Capacity options forwarded to BaseCaching. With only a
+            byte budget, the ghost lists are sized on the number of items
+            currently cached.
+        """
+        super().__init__(**kwargs)
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+        self.p = 0
+
+    def put(self, key, item, ttl=None):
+        """
+        Add an item to the cache using ARC algorithm.
+
+        Args:
+            key: The key for the cache entry.
+            item: The value to be stored in the cache.
+            ttl (float): Seconds the entry lives; defaults to the cache's
+            default_ttl.
+
+        Notes:
+            If key or item is None, this method does nothing.
+            A cached or ghost key is stored as frequently used; any other
+            key is stored as recently used.
+            If the cache exceeds its capacity, discard items from the list
+            that is larger than its adaptive target.
+        """
+        if key is None or item is None:
+            return
+        size = self._item_size(item)
+        capacity = self._capacity()
+        if key in self.b1:
+            self.p = min(capacity, self.p + max(len(self.b2) / len(self.b1),
+                                                1))
+        elif key in self.b2:
+            self.p = max(0, self.p - max(len(self.b1) / len(self.b2), 1))
+        if not self._reserve(key, size):
+            return
+        if key in self.t1:
+            del self.t1[key]
+            self.t2[key] = None
+        elif key in self.t2:
+            self.t2.move_to_end(key)
+        elif key in self.b1 or key in self.b2:
+            self.b1.pop(key, None)
+            self.b2.pop(key, None)
+            self.t2[key] = None
+        else:
+            self.t1[key] = None
+        self._store(key, item, size, ttl)
+
+    def get(self, key):
+        """
+        Retrieve an item from the cache.
+
+        Args:
+            key: The key to look up in the cache.
+
+        Returns:
+            The value associated with the key, or None if not found or
+            expired.
+        """
+        if key is None or not self._live(key):
+            return None
+        if key in self.t1:
+            del self.t1[key]
+            self.t2[key] = None
+        else:
+            self.t2.move_to_end(key)
+        return self.cache_data[key]
+
+    def _capacity(self):
+        """
+        Return the number of items the lists are balanced against.
+        """
+        if self.max_items is not None:
+            return self.max_items
+        return max(len(self.cache_data), 1)
+
+    def _victim(self, keep=None):
+        """
+        Return the LRU key of `t1` or `t2`, whichever exceeds its target.
+        """
+        t1_size = len(self.t1) - (keep in self.t1)
+        if t1_size > 0 and (t1_size > self.p or
+                            (keep in self.b2 and t1_size == self.p)):
+            lists = (self.t1, self.t2)
+        else:
+            lists = (self.t2, self.t1)
+        for keys in lists:
+            for key in keys:
+                if key != keep:
+                    return key
+
+    def _discard(self, key, reason="capacity"):
+        """
+        Evict a key, remembering capacity evictions in a ghost list.
+        """
+        ghost = self.b1 if key in self.t1 else self.b2
+        super()._discard(key, reason)
+        if reason != "capacity":
+            return
+        ghost[key] = None
+        capacity = self._capacity()
+        while self.b1 and len(self.t1) + len(self.b1) > capacity:
+            self.b1.popitem(last=False)
+        while self.b2 and len(self.cache_data) + len(self.b1) + \
+                len(self.b2) > 2 * capacity:
+            self.b2.popitem(last=False)
+
+    def _forget(self, key):
+        """
+        Remove a key from the cached lists.
+        """
+        if key in self.t1:
+            del self.t1[key]
+        else:
+            del self.t2[key]
+
+    def _snapshot_entries(self):
+        """
+        Yield the keys of `t1` then of `t2`, LRU first, tagged by list.
+        """
+        for key in self.t1:
+            yield key, 1
+        for key in self.t2:
+            yield key, 2
+
+    def _restore_entry(self, key, meta):
+        """
+        Append a restored key to the list it was saved from.
+        """
+        (self.t2 if meta == 2 else self.t1)[key] = None
+
+    def _snapshot_state(self):
+        """
+        Return the target size of `t1` and the ghost lists.
+        """
+        return self.p, list(self.b1), list(self.b2)
+
+    def _restore_state(self, state):
+        """
+        Restore the target size of `t1` and the ghost lists.
+        """
+        self.p, b1, b2 = state
+        self.b1 = OrderedDict.fromkeys(b1)
+        self.b2 = OrderedDict.fromkeys(b2)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""A Window TinyLFU (W-TinyLFU) caching module.
+
+This module defines a `WTinyLFUCache` class that allows storing and
+retrieving items from a dictionary-based cache. New keys enter a small LRU
+window. When the window overflows, its least recently used key only enters
+the main cache if a count-min sketch estimates it is used more often than
+the key the main cache would discard; otherwise the newcomer is discarded.
+The main cache is a segmented LRU: keys enter on probation and are
+protected once they are hit again.
+
+The admission filter keeps one-off keys, such as a crawler scanning every
+page, from pushing the frequently used keys out of the cache.
+
+Attributes:
+    cache_data (dict): A dictionary to store cached items.
+    window (OrderedDict): Recently admitted keys, LRU first.
+    probation (OrderedDict): Main cache keys hit once, LRU first.
+    protected (OrderedDict): Main cache keys hit again, LRU first.
+    sketch (CountMinSketch): Access frequency estimates.
+"""
+
+from collections import OrderedDict
+
+from base_caching import BaseCaching
+
+# Halves every 4-bit counter of a sketch row in a single translate call
+HALVE = bytes(count >> 1 for count in range(256))
+
+
+class CountMinSketch:
+    """
+    A count-min sketch of small saturating counters that ages by halving.
+    """
+
+    SEEDS = (0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D, 0x27D4EB2F)
+
+    def __init__(self, width, sample_size=None):
+        """
+        Initialize the sketch.
+
+        Args:
+            width (int): Counters per row, rounded up to a power of two.
+            sample_size (int): Increments after which every counter is
+            halved. Defaults to ten times the width.
+        """
+        self.width = 1 << max(width - 1, 1).bit_length()
+        self.mask = self.width - 1
+        self.table = bytearray(self.width * len(self.SEEDS))
+        self.sample_size = sample_size or 10 * self.width
+        self.additions = 0
+
+    def _indexes(self, key):
+        """
+        Return the counter index of a key in each row.
+        """
+        h = hash(key)
+        return [row * self.width + (((h ^ (h >> 16)) * seed >> 16) &
+                                    self.mask)
+                for row, seed in enumerate(self.SEEDS)]
+
+    def increment(self, key):
+        """
+        Count one access to a key.
+        """
+        table = self.table
+        for index in self._indexes(key):
+            if table[index] < 15:
+                table[index] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.table = bytearray(self.table.translate(HALVE))
+            self.additions //= 2
+
+    def estimate(self, key):
+        """
+        Return the estimated access count of a key.
+        """
+        table = self.table
+        return min(table[index] for index in self._indexes(key))
+
+
+class WTinyLFUCache(BaseCaching):
+    """
+    A caching system that inherits from BaseCaching and uses W-TinyLFU.
+    """
+
+    def __init__(self, window_ratio=0.01, protected_ratio=0.8,
+                 sketch_width=None, **kwargs):
+        """
+        Initialize the W-TinyLFU cache.
+
+        Args:
+            window_ratio (float): Share of the capacity given to the window.
+            protected_ratio (float): Share of the main cache given to the
+            protected segment.
+            sketch_width (int): Counters per sketch row. Defaults to the item
+            capacity, or 4096 with only a byte budget.
+            **kwargs: Capacity options forwarded to BaseCaching. With only a
+            byte budget, segments are sized on the number of items currently
+            cached.
+        """
+        super().__init__(**kwargs)
+        self.window_ratio = window_ratio
+        self.protected_ratio = protected_ratio
+        self.window = OrderedDict()
+        self.probation = OrderedDict()
+        self.protected = OrderedDict()
+        self.sketch = CountMinSketch(sketch_width or self.max_items or 4096)
+
+    def put(self, key, item, ttl=None):
+        """
+        Add an item to the cache using W-TinyLFU algorithm.
+
+        Args:
+            key: The key for the cache entry.
+            item: The value to be stored in the cache.
+            ttl (float): Seconds the entry lives; defaults to the cache's
+            default_ttl.
+
+        Notes:
+            If key or item is None, this method does nothing.
+            New keys enter the window. If the cache exceeds its capacity,
+            the window's LRU key and the main cache's LRU key compete and the
+            less frequently used one is discarded.
+        """
+        if key is None or item is None:
+            return
+        self.sketch.increment(key)
+        size = self._item_size(item)
+        if not self._reserve(key, size):
+            return
+        if key in self.cache_data:
+            self._hit(key)
+            self._store(key, item, size, ttl)
+            return
+        self.window[key] = None
+        self._store(key, item, size, ttl)
+        # While the main cache has room, window overflow moves in freely
+        capacity = self._capacity()
+        window_size = self._window_size(capacity)
+        while len(self.window) > window_size and \
+                len(self.probation) + len(self.protected) < \
+                capacity - window_size:
+            candidate, _ = self.window.popitem(last=False)
+            self.probation[candidate] = None
+
+    def get(self, key):
+        """
+        Retrieve an item from the cache.
+
+        Args:
+            key: The key to look up in the cache.
+
+        Returns:
+            The value associated with the key, or None if not found or
+            expired.
+        """
+        if key is None:
+            return None
+        self.sketch.increment(key)
+        if not self._live(key):
+            return None
+        self._hit(key)
+        return self.cache_data[key]
+
+    def _hit(self, key):
+        """
+        Refresh a cached key, promoting it from probation to protected.
+        """
+        if key in self.window:
+            self.window.move_to_end(key)
+        elif key in self.protected:
+            self.protected.move_to_end(key)
+        else:
+            del self.probation[key]
+            self.protected[key] = None
+            capacity = self._capacity()
+            main_size = capacity - self._window_size(capacity)
+            if len(self.protected) > max(1, int(main_size *
+                                                self.protected_ratio)):
+                demoted, _ = self.protected.popitem(last=False)
+                self.probation[demoted] = None
+
+    def _capacity(self):
+        """
+        Return the number of items the segments are sized against.
+        """
+        if self.max_items is not None:
+            return self.max_items
+        return max(len(self.cache_data), 1)
+
+    def _window_size(self, capacity):
+        """
+        Return the number of items the window may hold.
+        """
+        return max(1, int(capacity * self.window_ratio))
+
+    def _victim(self, keep=None):
+        """
+        Return the loser of the window candidate and main victim duel.
+        """
+        candidate = next((k for k in self.window if k != keep), None)
+        victim = next((k for k in self.probation if k != keep), None)
+        if victim is None:
+            victim = next((k for k in self.protected if k != keep), None)
+        if candidate is None:
+            return victim
+        if victim is None or \
+                len(self.window) < self._window_size(self._capacity()):
+            return victim if victim is not None else candidate
+        if self.sketch.estimate(candidate) > self.sketch.estimate(victim):
+            # Admit the candidate into the main cache
+            del self.window[candidate]
+            self.probation[candidate] = None
+            return victim
+        return candidate
+
+    def _forget(self, key):
+        """
+        Remove a key from its segment.
+        """
+        for segment in (self.window, self.probation, self.protected):
+            if key in segment:
+                del segment[key]
+                return
+
+    def _snapshot_entries(self):
+        """
+        Yield the keys of each segment, LRU first, tagged by segment.
+        """
+        for meta, segment in enumerate((self.window, self.probation,
+                                        self.protected)):
+            for key in segment:
+                yield key, meta
+
+    def _restore_entry(self, key, meta):
+        """
+        Append a restored key to the segment it was saved from.
+        """
+        segments = (self.window, self.probation, self.protected)
+        segments[meta or 0][key] = None
+
+    def _snapshot_state(self):
+        """
+        Return the frequency sketch.
+        """
+        sketch = self.sketch
+        return sketch.width, bytes(sketch.table), sketch.additions
+
+    def _restore_state(self, state):
+        """
+        Restore the frequency sketch if it has the same width.
+        """
+        width, table, additions = state
+        if width == self.sketch.width:
+            self.sketch.table = bytearray(table)
+            self.sketch.additions = additions
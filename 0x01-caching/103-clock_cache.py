@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""A CLOCK (approximate LRU) caching module.
+
+This module defines a `ClockCache` class that allows storing and retrieving
+items from a dictionary-based cache. Every cached key owns a slot of a
+preallocated ring, with one reference bit per slot in a `bytearray`. A hit
+only sets the bit of its slot: unlike LRU, `get` never reorders a shared
+structure and never allocates. When the cache is full, a clock hand sweeps
+the ring, clearing set bits and giving those keys a second chance, and
+discards the first key whose bit is already clear.
+
+Because `get` only reads dictionaries and stores one byte, readers need no
+lock: they may run concurrently with each other and with a single writer
+serialized by the caller. This holds while no entry carries a TTL, since
+reading an expired entry removes it.
+
+Attributes:
+    cache_data (dict): A dictionary to store cached items.
+    keys (list): The key held by each slot, or None for a free slot.
+    referenced (bytearray): The reference bit of each slot.
+    hand (int): The slot the clock hand points at.
+"""
+
+from base_caching import BaseCaching
+
+
+class ClockCache(BaseCaching):
+    """
+    A caching system that inherits from BaseCaching and uses CLOCK.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        Initialize the CLOCK cache.
+
+        Args:
+            **kwargs: Capacity options forwarded to BaseCaching. The ring is
+            preallocated for max_items slots; with only a byte budget it
+            grows as items are added.
+        """
+        super().__init__(**kwargs)
+        slots = self.max_items or 0
+        self.keys = [None] * slots
+        self.referenced = bytearray(slots)
+        self.hand = 0
+        self._slot_of = {}
+        self._free = list(range(slots - 1, -1, -1))
+
+    def put(self, key, item, ttl=None):
+        """
+        Add an item to the cache using CLOCK algorithm.
+
+        Args:
+            key: The key for the cache entry.
+            item: The value to be stored in the cache.
+            ttl (float): Seconds the entry lives; defaults to the cache's
+            default_ttl.
+
+        Notes:
+            If key or item is None, this method does nothing.
+            Updating a cached key counts as a reference.
+            If the cache exceeds its capacity, sweep the clock hand and
+            discard the first unreferenced keys.
+        """
+        if key is None or item is None:
+            return
+        size = self._item_size(item)
+        if not self._reserve(key, size):
+            return
+        slot = self._slot_of.get(key)
+        if slot is not None:
+            self.referenced[slot] = 1
+        else:
+            self._take_slot(key)
+        self._store(key, item, size, ttl)
+
+    def get(self, key):
+        """
+        Retrieve an item from the cache, setting its reference bit.
+
+        Args:
+            key: The key to look up in the cache.
+
+        Returns:
+            The value associated with the key, or None if not found or
+            expired.
+        """
+        if self._expires and not self._live(key):
+            return None
+        item = self.cache_data.get(key)
+        if item is not None:
+            slot = self._slot_of.get(key)
+            if slot is not None:
+                self.referenced[slot] = 1
+        return item
+
+    def _victim(self, keep=None):
+        """
+        Sweep the hand to the first unreferenced key other than `keep`.
+        """
+        keys = self.keys
+        referenced = self.referenced
+        slots = len(keys)
+        # A restored hand may point past a ring that was not refilled
+        hand = self.hand if self.hand < slots else 0
+        while True:
+            key = keys[hand]
+            if key is not None and key != keep:
+                if not referenced[hand]:
+                    self.hand = (hand + 1) % slots
+                    return key
+                referenced[hand] = 0
+            hand = (hand + 1) % slots
+
+    def _forget(self, key):
+        """
+        Free the slot of a removed key.
+        """
+        slot = self._slot_of.pop(key)
+        self.keys[slot] = None
+        self.referenced[slot] = 0
+        self._free.append(slot)
+
+    def _take_slot(self, key):
+        """
+        Give a new key a free slot, growing the ring if there is none.
+        """
+        if not self._free:
+            self.keys.append(None)
+            self.referenced.append(0)
+            self._free.append(len(self.keys) - 1)
+        slot = self._free.pop()
+        self.keys[slot] = key
+        self._slot_of[key] = slot
+        return slot
+
+    def _snapshot_entries(self):
+        """
+        Yield keys with their reference bit, in ring order.
+        """
+        for slot, key in enumerate(self.keys):
+            if key is not None:
+                yield key, self.referenced[slot]
+
+    def _restore_entry(self, key, meta):
+        """
+        Give a restored key the next slot, with its saved reference bit.
+        """
+        self.referenced[self._take_slot(key)] = meta or 0
+
+    def _snapshot_state(self):
+        """
+        Return the hand, as the number of keys in the ring before it.
+
+        Restored keys fill the slots of an empty ring from 0 in ring order,
+        so this count is the slot the hand points at once they are back.
+        """
+        return sum(key is not None for key in self.keys[:self.hand])
+
+    def _restore_state(self, state):
+        """
+        Point the hand at the slot of the key it was at when saved.
+        """
+        self.hand = state or 0
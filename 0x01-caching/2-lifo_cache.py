@@ -10,6 +10,8 @@ Attributes:
     behavior.
 """
 
+from collections import OrderedDict
+
 from base_caching import BaseCaching
 
 
@@ -18,31 +20,37 @@ class LIFOCache(BaseCaching):
     A caching system that inherits from BaseCaching and uses LIFO algorithm.
     """
 
-    def __init__(self):
+    def __init__(self, **kwargs):
         """
         Initialize the LIFO cache.
+
+        Args:
+            **kwargs: Capacity options forwarded to BaseCaching.
         """
-        super().__init__()  # Call the parent class constructor
+        super().__init__(**kwargs)  # Call the parent class constructor
+        self.cache_data = OrderedDict()  # Last put key last
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """
         Add an item to the cache using LIFO algorithm.
 
         Args:
             key: The key for the cache entry.
             item: The value to be stored in the cache.
+            ttl (float): Seconds the entry lives; defaults to the cache's
+            default_ttl.
 
         Notes:
             If key or item is None, this method does nothing.
-            If the cache size exceeds BaseCaching.MAX_ITEMS, discard
-            the last item.
+            If the cache exceeds its capacity, discard the last item put
+            before this one.
         """
-        if key is not None and item is not None:
-            if len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-                last_key = next(reversed(self.cache_data))
-                print(f"DISCARD: {last_key}")
-                del self.cache_data[last_key]
-            self.cache_data[key] = item
+        if key is None or item is None:
+            return
+        size = self._item_size(item)
+        if self._reserve(key, size):
+            self._store(key, item, size, ttl)
+            self.cache_data.move_to_end(key)
 
     def get(self, key):
         """
@@ -52,6 +60,30 @@ class LIFOCache(BaseCaching):
             key: The key to look up in the cache.
 
         Returns:
-            The value associated with the key, or None if not found.
+            The value associated with the key, or None if not found or
+            expired.
+        """
+        return self.cache_data[key] if self._live(key) else None
+
+    def get_many(self, keys):
+        """
+        Retrieve several items in a single pass over the keys.
+
+        Args:
+            keys (iterable): The keys to look up.
+
+        Returns:
+            dict: The cached items of the keys that were found.
+        """
+        if self.stats is not None or self._expires:
+            return super().get_many(keys)
+        data = self.cache_data
+        return {key: data[key] for key in keys if key in data}
+
+    def _victim(self, keep=None):
+        """
+        Return the last put key other than `keep`.
         """
-        return self.cache_data.get(key)
+        keys = reversed(self.cache_data)
+        last_key = next(keys)
+        return next(keys) if last_key == keep else last_key
@@ -5,11 +5,22 @@ This module defines an `LRUCache` class that allows storing and retrieving
 items from a dictionary-based cache. When the cache reaches its maximum
 capacity, it removes the least recently used item (based on access order).
 
+Recency is tracked by the order of `cache_data` itself: the least recently
+used key is always first and the most recently used key is always last, so
+`get`, `put` and eviction all run in constant time regardless of capacity.
+`put_many` inserts a whole batch before evicting once: since every key put
+becomes the most recently used, the keys discarded at the end are exactly
+those the same puts would have discarded one at a time. This only holds
+for an item count limit, as a byte budget also depends on the order in
+which values grow and shrink.
+
 Attributes:
     cache_data (OrderedDict): A dictionary to store cached items with LRU
     behavior.
 """
 
+from collections import OrderedDict
+
 from base_caching import BaseCaching
 
 
@@ -18,34 +29,39 @@ class LRUCache(BaseCaching):
     A caching system that inherits from BaseCaching and uses LRU algorithm.
     """
 
-    def __init__(self):
+    def __init__(self, **kwargs):
         """
         Initialize the LRU cache.
+
+        Args:
+            **kwargs: Capacity options forwarded to BaseCaching.
         """
-        super().__init__()  # Call the parent class constructor
-        self.usage_order = []  # Maintain order of keys based on usage
+        super().__init__(**kwargs)  # Call the parent class constructor
+        self.cache_data = OrderedDict()  # Oldest key first, newest last
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """
         Add an item to the cache using LRU algorithm.
 
         Args:
             key: The key for the cache entry.
             item: The value to be stored in the cache.
+            ttl (float): Seconds the entry lives; defaults to the cache's
+            default_ttl.
 
         Notes:
             If key or item is None, this method does nothing.
-            If the cache size exceeds BaseCaching.MAX_ITEMS, discard
-            the least recently used item.
+            If the key is already cached, its value is replaced in place and
+            it becomes the most recently used key.
+            If the cache exceeds its capacity, discard the least
+            recently used items.
         """
-        if key is not None and item is not None:
-            if len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-                # Discard the least recently used item
-                lru_key = self.usage_order.pop(0)
-                print(f"DISCARD: {lru_key}")
-                del self.cache_data[lru_key]
-            self.cache_data[key] = item
-            self.usage_order.append(key)
+        if key is None or item is None:
+            return
+        size = self._item_size(item)
+        if self._reserve(key, size):
+            self._store(key, item, size, ttl)
+            self.cache_data.move_to_end(key)
 
     def get(self, key):
         """
@@ -55,11 +71,68 @@ class LRUCache(BaseCaching):
             key: The key to look up in the cache.
 
         Returns:
-            The value associated with the key, or None if not found.
+            The value associated with the key, or None if not found or
+            expired.
+        """
+        if key is None or not self._live(key):
+            return None
+        # Update usage order (move key to the end)
+        self.cache_data.move_to_end(key)
+        return self.cache_data[key]
+
+    def get_many(self, keys):
+        """
+        Retrieve several items, refreshing each key found.
+
+        Args:
+            keys (iterable): The keys to look up.
+
+        Returns:
+            dict: The cached items of the keys that were found.
+        """
+        if self.stats is not None or self._expires:
+            return super().get_many(keys)
+        data = self.cache_data
+        move_to_end = data.move_to_end
+        found = {}
+        for key in keys:
+            if key in data:
+                move_to_end(key)
+                found[key] = data[key]
+        return found
+
+    def put_many(self, mapping, ttl=None):
+        """
+        Add several items, discarding least recently used items once.
+
+        Args:
+            mapping (dict): The items to cache, by key.
+            ttl (float): Seconds the entries live; defaults to default_ttl.
+
+        Notes:
+            The cache ends up in the same state as after calling `put` for
+            each item in turn, except that a key discarded and put again
+            within the batch is not reported as discarded.
+        """
+        if self.stats is not None or self.max_bytes is not None:
+            super().put_many(mapping, ttl)
+            return
+        if self._expiry_heap and self._expiry_heap[0][0] <= self.clock():
+            self.expire()
+        data = self.cache_data
+        move_to_end = data.move_to_end
+        store = self._store
+        for key, item in mapping.items():
+            if key is not None and item is not None:
+                store(key, item, 0, ttl)
+                move_to_end(key)
+        while self._over_capacity(0, 0):
+            self._discard(self._victim())
+
+    def _victim(self, keep=None):
+        """
+        Return the least recently used key other than `keep`.
         """
-        if key in self.cache_data:
-            # Update usage order (move key to the end)
-            self.usage_order.remove(key)
-            self.usage_order.append(key)
-            return self.cache_data[key]
-        return None
+        keys = iter(self.cache_data)
+        lru_key = next(keys)
+        return next(keys) if lru_key == keep else lru_key
@@ -7,9 +7,11 @@ capacity, it removes the most recently used item (based on access order).
 
 Attributes:
     cache_data (OrderedDict): A dictionary to store cached items with MRU
-    behavior.
+    behavior, the most recently used key last.
 """
 
+from collections import OrderedDict
+
 from base_caching import BaseCaching
 
 
@@ -18,34 +20,37 @@ class MRUCache(BaseCaching):
     A caching system that inherits from BaseCaching and uses MRU algorithm.
     """
 
-    def __init__(self):
+    def __init__(self, **kwargs):
         """
         Initialize the MRU cache.
+
+        Args:
+            **kwargs: Capacity options forwarded to BaseCaching.
         """
-        super().__init__()  # Call the parent class constructor
-        self.usage_order = []  # Maintain order of keys based on usage
+        super().__init__(**kwargs)  # Call the parent class constructor
+        self.cache_data = OrderedDict()  # Most recently used key last
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """
         Add an item to the cache using MRU algorithm.
 
         Args:
             key: The key for the cache entry.
             item: The value to be stored in the cache.
+            ttl (float): Seconds the entry lives; defaults to the cache's
+            default_ttl.
 
         Notes:
             If key or item is None, this method does nothing.
-            If the cache size exceeds BaseCaching.MAX_ITEMS, discard
-            the most recently used item.
+            If the cache exceeds its capacity, discard the most recently
+            used items, never the key being put.
         """
-        if key is not None and item is not None:
-            if len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-                # Discard the most recently used item
-                mru_key = self.usage_order.pop()
-                print(f"DISCARD: {mru_key}")
-                del self.cache_data[mru_key]
-            self.cache_data[key] = item
-            self.usage_order.append(key)
+        if key is None or item is None:
+            return
+        size = self._item_size(item)
+        if self._reserve(key, size):
+            self._store(key, item, size, ttl)
+            self.cache_data.move_to_end(key)
 
     def get(self, key):
         """
@@ -55,11 +60,40 @@ class MRUCache(BaseCaching):
             key: The key to look up in the cache.
 
         Returns:
-            The value associated with the key, or None if not found.
+            The value associated with the key, or None if not found or
+            expired.
+        """
+        if key is None or not self._live(key):
+            return None
+        # Update usage order (move key to the end)
+        self.cache_data.move_to_end(key)
+        return self.cache_data[key]
+
+    def get_many(self, keys):
+        """
+        Retrieve several items, refreshing each key found.
+
+        Args:
+            keys (iterable): The keys to look up.
+
+        Returns:
+            dict: The cached items of the keys that were found.
+        """
+        if self.stats is not None or self._expires:
+            return super().get_many(keys)
+        data = self.cache_data
+        move_to_end = data.move_to_end
+        found = {}
+        for key in keys:
+            if key in data:
+                move_to_end(key)
+                found[key] = data[key]
+        return found
+
+    def _victim(self, keep=None):
+        """
+        Return the most recently used key other than `keep`.
         """
-        if key in self.cache_data:
-            # Update usage order (move key to the end)
-            self.usage_order.remove(key)
-            self.usage_order.append(key)
-            return self.cache_data[key]
-        return None
+        keys = reversed(self.cache_data)
+        mru_key = next(keys)
+        return next(keys) if mru_key == keep else mru_key
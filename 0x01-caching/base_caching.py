@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""BaseCaching module.
+
+This module defines the `BaseCaching` class every caching policy inherits
+from. It owns the cached data and the capacity of a cache, which is set per
+instance either as a number of items, as a total byte budget, or both.
+
+Entries may also carry a time to live. Expired entries are dropped lazily
+when they are read, before any capacity eviction, and by `expire`, which
+an optional background sweeper calls periodically. Deadlines are kept in a
+heap, so a sweep only touches the entries that are actually due.
+
+Evictions are reported to an `on_evict(key, reason)` callback, which by
+default prints the `DISCARD:` lines of capacity evictions. Hit, miss,
+insert, update and eviction counters, and optionally latency histograms,
+are kept when the cache is built with `stats=True` or `latency=True`.
+
+Policies only decide *which* key to discard (`_victim`) and keep their own
+bookkeeping in sync (`_forget`); making room, discarding and byte accounting
+are shared here.
+"""
+
+import heapq
+import sys
+import threading
+import time
+
+import cache_snapshot
+from cache_stats import CacheStats, instrument, print_discard
+
+
+class BaseCaching():
+    """ BaseCaching defines:
+      - constants of your caching system
+      - where your data are stored (in a dictionary)
+      - how much the cache may hold
+    """
+    MAX_ITEMS = 4
+
+    def __init__(self, max_items=None, max_bytes=None, sizer=None,
+                 default_ttl=None, clock=None, on_evict=print_discard,
+                 stats=False, latency=False):
+        """
+        Initialize the cache.
+
+        Args:
+            max_items (int): Maximum number of cached items. Defaults to
+            MAX_ITEMS unless a byte budget is given, in which case the item
+            count is unbounded.
+            max_bytes (int): Optional budget for the total size of cached
+            items.
+            sizer (callable): Returns the size in bytes of an item; only
+            used with max_bytes or stats. Defaults to `sys.getsizeof`.
+            default_ttl (float): Seconds an entry lives when `put` is not
+            given a ttl. Entries never expire by default.
+            clock (callable): Returns the current time in seconds. Defaults
+            to `time.monotonic`.
+            on_evict (callable): Called with the key and the reason
+            (capacity, expired or oversize) of every eviction, just before
+            the key is removed so its value can still be read, or None to
+            stay silent. Defaults to printing capacity evictions.
+            stats (bool): Count hits, misses, inserts, updates and
+            evictions in `stats`, and the bytes cached.
+            latency (bool): Also record get and put latency histograms;
+            implies stats.
+        """
+        if max_items is None and max_bytes is None:
+            max_items = self.MAX_ITEMS
+        assert max_items is None or (isinstance(max_items, int) and
+                                     max_items > 0)
+        assert max_bytes is None or (isinstance(max_bytes, int) and
+                                     max_bytes > 0)
+        self.cache_data = {}
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.sizer = sizer or sys.getsizeof
+        self.current_bytes = 0
+        self._sizes = {}
+        self.default_ttl = default_ttl
+        self.clock = clock or time.monotonic
+        self._expires = {}
+        self._expiry_heap = []
+        self._expiry_seq = 0
+        self.on_evict = on_evict
+        self.stats = None
+        if stats or latency:
+            self.stats = CacheStats(latency)
+            instrument(self)
+        self._sized = max_bytes is not None or self.stats is not None
+
+    def print_cache(self):
+        """ Print the cache
+        """
+        print("Current cache:")
+        for key in sorted(self.cache_data.keys()):
+            print("{}: {}".format(key, self.cache_data.get(key)))
+
+    def put(self, key, item, ttl=None):
+        """ Add an item in the cache
+        """
+        raise NotImplementedError("put must be implemented in your "
+                                  "cache class")
+
+    def get(self, key):
+        """ Get an item by key
+        """
+        raise NotImplementedError("get must be implemented in your "
+                                  "cache class")
+
+    def get_many(self, keys):
+        """
+        Retrieve several items, as if `get` was called for each key in turn.
+
+        Args:
+            keys (iterable): The keys to look up.
+
+        Returns:
+            dict: The cached items of the keys that were found.
+        """
+        get = self.get
+        found = {}
+        for key in keys:
+            item = get(key)
+            if item is not None:
+                found[key] = item
+        return found
+
+    def put_many(self, mapping, ttl=None):
+        """
+        Add several items, as if `put` was called for each one in turn.
+
+        Args:
+            mapping (dict): The items to cache, by key.
+            ttl (float): Seconds the entries live; defaults to default_ttl.
+        """
+        put = self.put
+        for key, item in mapping.items():
+            put(key, item, ttl)
+
+    def get_stats(self):
+        """
+        Return the usage counters along with the current size.
+
+        Returns:
+            dict: `items` currently cached, plus the `bytes` they take and
+            the counters of `stats` when instrumentation is enabled. Without
+            stats, `bytes` is only reported under a byte budget.
+        """
+        report = {"items": len(self.cache_data)}
+        if self._sized:
+            report["bytes"] = self.current_bytes
+        if self.stats is not None:
+            report.update(self.stats.as_dict())
+        return report
+
+    def expire(self):
+        """
+        Remove every entry whose time to live has passed.
+
+        Returns:
+            int: The number of expired entries removed.
+        """
+        heap = self._expiry_heap
+        now = self.clock()
+        removed = 0
+        while heap and heap[0][0] <= now:
+            deadline, _, key = heapq.heappop(heap)
+            # Entries updated or removed since leave stale heap records
+            if self._expires.get(key) == deadline:
+                self._discard(key, "expired")
+                removed += 1
+        return removed
+
+    def start_sweeper(self, interval, lock):
+        """
+        Call `expire` every `interval` seconds from a daemon thread.
+
+        Caches are not thread-safe, so the sweeper needs the lock that
+        guards every other call on the cache; a `ShardedCache` sweeps its
+        shards under their own locks instead.
+
+        Args:
+            interval (float): Seconds between two sweeps.
+            lock: Lock held during each sweep. Callers sharing the cache
+            with the sweeper must hold the same lock around their own calls.
+
+        Returns:
+            threading.Event: Set it to stop the sweeper.
+        """
+        assert lock is not None, "the sweeper needs the cache's lock"
+        stopped = threading.Event()
+
+        def sweep():
+            while not stopped.wait(interval):
+                with lock:
+                    self.expire()
+
+        threading.Thread(target=sweep, daemon=True).start()
+        return stopped
+
+    def snapshot(self, path):
+        """
+        Save the cache, including its policy state and TTLs, to a file.
+
+        Args:
+            path (str): The snapshot file.
+
+        Returns:
+            int: The number of entries written.
+        """
+        return cache_snapshot.save_snapshot(self, path)
+
+    def restore(self, path):
+        """
+        Fill this empty cache from a snapshot saved by the same policy.
+
+        Args:
+            path (str): The snapshot file.
+
+        Returns:
+            int: The number of entries restored.
+        """
+        return cache_snapshot.load_snapshot(self, path)
+
+    def _victim(self, keep=None):
+        """
+        Return the key the policy wants to discard next.
+
+        Args:
+            keep: A key that must not be chosen, typically the one being
+            updated.
+        """
+        raise NotImplementedError("_victim must be implemented in your "
+                                  "cache class")
+
+    def _forget(self, key):
+        """
+        Drop the policy bookkeeping of a key removed from the cache.
+
+        Args:
+            key: The removed key.
+        """
+
+    def _snapshot_entries(self):
+        """
+        Yield each key with its policy metadata, in an order that rebuilds
+        the policy state when replayed through `_restore_entry`.
+        """
+        for key in self.cache_data:
+            yield key, None
+
+    def _restore_entry(self, key, meta):
+        """
+        Rebuild the policy bookkeeping of a key restored from a snapshot.
+
+        Args:
+            key: The restored key, already stored in `cache_data`.
+            meta: The metadata `_snapshot_entries` yielded for it.
+        """
+
+    def _snapshot_state(self):
+        """
+        Return the policy-wide state to save along with the entries.
+        """
+        return None
+
+    def _restore_state(self, state):
+        """
+        Restore the policy-wide state returned by `_snapshot_state`.
+        """
+
+    def _item_size(self, item):
+        """
+        Return the size charged for an item, or 0 when sizes are not
+        tracked, i.e. without a byte budget or stats.
+
+        Args:
+            item: The value about to be cached.
+        """
+        if not self._sized:
+            return 0
+        return self.sizer(item)
+
+    def _reserve(self, key, size):
+        """
+        Discard items until an entry of `size` bytes for `key` fits.
+
+        Args:
+            key: The key about to be stored or updated.
+            size (int): The size returned by `_item_size`.
+
+        Returns:
+            bool: False if the item is larger than the whole byte budget and
+            must not be cached; any previous value of the key is dropped.
+        """
+        if self._expiry_heap and self._expiry_heap[0][0] <= self.clock():
+            self.expire()
+        if self.max_bytes is not None and size > self.max_bytes:
+            if key in self.cache_data:
+                self._discard(key, "oversize")
+            return False
+        if key in self.cache_data:
+            new_items = 0
+            new_bytes = size - self._sizes.get(key, 0)
+        else:
+            new_items = 1
+            new_bytes = size
+        while self._over_capacity(new_items, new_bytes):
+            self._discard(self._victim(keep=key))
+        return True
+
+    def _over_capacity(self, new_items, new_bytes):
+        """
+        Tell whether adding the given items and bytes exceeds the capacity.
+        """
+        if self.max_items is not None and \
+                len(self.cache_data) + new_items > self.max_items:
+            return True
+        return self.max_bytes is not None and \
+            self.current_bytes + new_bytes > self.max_bytes
+
+    def _store(self, key, item, size, ttl=None):
+        """
+        Write an item once `_reserve` has made room for it.
+
+        Args:
+            ttl (float): Seconds the entry lives, or None for the default.
+        """
+        if self._sized:
+            self.current_bytes += size - self._sizes.get(key, 0)
+            self._sizes[key] = size
+        self.cache_data[key] = item
+        if ttl is None:
+            ttl = self.default_ttl
+        if ttl is not None:
+            deadline = self.clock() + ttl
+            self._expires[key] = deadline
+            self._expiry_seq += 1
+            heapq.heappush(self._expiry_heap,
+                           (deadline, self._expiry_seq, key))
+            if len(self._expiry_heap) > 2 * len(self._expires) + 64:
+                self._compact_expiry_heap()
+        elif self._expires:
+            self._expires.pop(key, None)
+
+    def _live(self, key):
+        """
+        Tell whether a key is cached and unexpired, dropping it if expired.
+        """
+        if key not in self.cache_data:
+            return False
+        deadline = self._expires.get(key)
+        if deadline is not None and deadline <= self.clock():
+            self._discard(key, "expired")
+            return False
+        return True
+
+    def _compact_expiry_heap(self):
+        """
+        Rebuild the deadline heap without its stale records.
+        """
+        self._expiry_heap = [
+            record for record in self._expiry_heap
+            if self._expires.get(record[2]) == record[0]
+        ]
+        heapq.heapify(self._expiry_heap)
+
+    def _discard(self, key, reason="capacity"):
+        """
+        Evict a key, counting and reporting why.
+
+        Args:
+            key: The key to evict.
+            reason (str): capacity, expired or oversize.
+        """
+        if self.stats is not None:
+            self.stats.evictions[reason] += 1
+        if self.on_evict is not None:
+            self.on_evict(key, reason)
+        self._remove(key)
+
+    def _remove(self, key):
+        """
+        Remove a key from the data, the byte accounting and the policy.
+        """
+        del self.cache_data[key]
+        if self._sized:
+            self.current_bytes -= self._sizes.pop(key)
+        if self._expires:
+            self._expires.pop(key, None)
+        self._forget(key)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark of get_many/put_many against the same calls made one by one.
+
+For each policy and batch size, a cache is warmed up, then the same batches
+of keys are read and written both through the batch API and through
+sequential `get`/`put` calls. Results are nanoseconds per key and the
+speedup of the batch API.
+
+Usage:
+    ./bench_batch.py [keys_per_run]
+"""
+
+import random
+import sys
+import time
+
+POLICIES = {
+    '1-fifo_cache': 'FIFOCache',
+    '2-lifo_cache': 'LIFOCache',
+    '3-lru_cache': 'LRUCache',
+    '4-mru_cache': 'MRUCache',
+    '100-lfu_cache': 'LFUCache',
+    '101-arc_cache': 'ARCCache',
+    '102-tinylfu_cache': 'WTinyLFUCache',
+}
+BATCH_SIZES = (1, 10, 100, 1000)
+CAPACITY = 10_000
+
+
+def make_batches(batch_size, total):
+    """Returns batches of keys drawn from twice the cache capacity."""
+    rand = random.Random(batch_size)
+    return [[rand.randrange(2 * CAPACITY) for _ in range(batch_size)]
+            for _ in range(max(1, total // batch_size))]
+
+
+def sequential(cache, batches):
+    """Returns the seconds spent putting then getting keys one by one."""
+    get, put = cache.get, cache.put
+    start = time.perf_counter()
+    for batch in batches:
+        for key in batch:
+            put(key, key)
+        for key in batch:
+            get(key)
+    return time.perf_counter() - start
+
+
+def batched(cache, batches):
+    """Returns the seconds spent putting then getting whole batches."""
+    mappings = [{key: key for key in batch} for batch in batches]
+    start = time.perf_counter()
+    for batch, mapping in zip(batches, mappings):
+        cache.put_many(mapping)
+        cache.get_many(batch)
+    return time.perf_counter() - start
+
+
+def new_cache(policy):
+    """Returns a warm cache of the given policy."""
+    cache = policy(max_items=CAPACITY, on_evict=None)
+    for key in range(CAPACITY):
+        cache.put(key, key)
+    return cache
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"ns per key, {total} keys per run")
+    print(f"{'policy':>14} {'batch':>6} {'one by one':>11} {'batched':>9} "
+          f"{'speedup':>8}")
+    for module, name in POLICIES.items():
+        policy = getattr(__import__(module), name)
+        for batch_size in BATCH_SIZES:
+            batches = make_batches(batch_size, total)
+            keys = 2 * sum(len(batch) for batch in batches)
+            one_by_one = sequential(new_cache(policy), batches) / keys * 1e9
+            grouped = batched(new_cache(policy), batches) / keys * 1e9
+            print(f"{name:>14} {batch_size:>6} {one_by_one:>11.0f} "
+                  f"{grouped:>9.0f} {one_by_one / grouped:>7.2f}x")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark of ClockCache against LRUCache: hit ratio and read throughput.
+
+Hit ratios come from replaying the synthetic traces of trace_replay.py.
+Throughput is measured with reader threads calling `get` on Zipf keys while
+one writer thread keeps putting keys. LRU reorders its entries on every
+hit, so its readers must share the writer's lock; CLOCK readers only set a
+reference bit and take no lock at all. A snapshot round trip last checks
+that a restored ClockCache goes on evicting like the one it was saved from.
+
+Usage:
+    ./bench_clock_cache.py [readers] [reads_per_thread] [capacity]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+LRUCache = __import__('3-lru_cache').LRUCache
+ClockCache = __import__('103-clock_cache').ClockCache
+trace_replay = __import__('trace_replay')
+
+
+def restore_round_trip(capacity, trace):
+    """Tells whether a ClockCache restored halfway through a trace keeps
+    the same contents as the original over the second half."""
+    half = len(trace) // 2
+    original = ClockCache(max_items=capacity, on_evict=None)
+    trace_replay.replay(original, trace[:half])
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        original.snapshot(path)
+        restored = ClockCache(max_items=capacity, on_evict=None)
+        restored.restore(path)
+    finally:
+        os.remove(path)
+    for key in trace[half:]:
+        for cache in (original, restored):
+            if cache.get(key) is None:
+                cache.put(key, key)
+        if original.cache_data.keys() != restored.cache_data.keys():
+            return False
+    return True
+
+
+def read_throughput(cache, locked_reads, readers, reads, capacity):
+    """Returns the gets per second of `readers` threads beside a writer."""
+    lock = threading.Lock()
+    keys = trace_replay.zipf_trace(reads, capacity * 2)
+    for key in range(capacity):
+        cache.put(key, key)
+    stop = threading.Event()
+    barrier = threading.Barrier(readers + 1)
+
+    def writer():
+        key = capacity
+        while not stop.is_set():
+            with lock:
+                cache.put(key % (capacity * 2), key)
+            key += 1
+            time.sleep(0)
+
+    def reader():
+        get = cache.get
+        barrier.wait()
+        if locked_reads:
+            for key in keys:
+                with lock:
+                    get(key)
+        else:
+            for key in keys:
+                get(key)
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    writing = threading.Thread(target=writer)
+    writing.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    writing.join()
+    return readers * reads / elapsed
+
+
+if __name__ == "__main__":
+    readers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    reads = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    capacity = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    workloads = trace_replay.traces(capacity, 200_000)
+    print(f"capacity {capacity}")
+    print(f"{'policy':>10}" + "".join(f"{name:>8}" for name in workloads) +
+          f"{'reads/s':>14}")
+    for policy, locked_reads in ((LRUCache, True), (ClockCache, False)):
+        ratios = [trace_replay.replay(policy(max_items=capacity,
+                                             on_evict=None), trace)
+                  for trace in workloads.values()]
+        throughput = read_throughput(policy(max_items=capacity,
+                                            on_evict=None),
+                                     locked_reads, readers, reads, capacity)
+        print(f"{policy.__name__:>10}" +
+              "".join(f"{ratio:>8.1%}" for ratio in ratios) +
+              f"{throughput:>14,.0f}")
+    same = restore_round_trip(capacity, workloads["zipf"])
+    print(f"snapshot round trip: {'same' if same else 'DIFFERENT'} "
+          "evictions after restore")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark for LRUCache get/put cost as the capacity grows.
+
+Each size is filled to capacity first, then timed on a mix of hits (`get`),
+in-place updates (`put` of a cached key) and evicting inserts (`put` of a new
+key). With a constant-time LRU the per-operation cost stays flat from
+4 to 1,000,000 items.
+
+Usage:
+    ./bench_lru_cache.py [operations]
+"""
+
+import random
+import sys
+import time
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+SIZES = (4, 100, 10_000, 100_000, 1_000_000)
+
+
+def bench(size: int, operations: int) -> dict:
+    """Returns the mean nanoseconds per get, update and evicting put."""
+    cache = LRUCache(max_items=size, on_evict=None)
+    for key in range(size):
+        cache.put(key, key)
+    rand = random.Random(size)
+    hits = [rand.randrange(size) for _ in range(operations)]
+
+    start = time.perf_counter_ns()
+    for key in hits:
+        cache.get(key)
+    get_ns = (time.perf_counter_ns() - start) / operations
+
+    start = time.perf_counter_ns()
+    for key in hits:
+        cache.put(key, key)
+    update_ns = (time.perf_counter_ns() - start) / operations
+
+    start = time.perf_counter_ns()
+    for key in range(size, size + operations):
+        cache.put(key, key)
+    insert_ns = (time.perf_counter_ns() - start) / operations
+    return {"get": get_ns, "update": update_ns, "insert": insert_ns}
+
+
+if __name__ == "__main__":
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{'max_items':>10} {'get ns':>10} {'update ns':>10} "
+          f"{'insert ns':>10}")
+    for size in SIZES:
+        result = bench(size, operations)
+        print(f"{size:>10} {result['get']:>10.0f} {result['update']:>10.0f} "
+              f"{result['insert']:>10.0f}")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark reporting the bytes each policy spends per cached entry.
+
+Keys and values are allocated before tracing starts, so the figures only
+cover the cache's own bookkeeping: the data dictionary plus whatever order,
+frequency, size or expiry structures the policy and options add. Each
+cache's reported `bytes` is checked against the sizes of its values.
+
+Usage:
+    ./bench_memory.py [entries]
+"""
+
+import sys
+import tracemalloc
+
+POLICIES = {
+    '0-basic_cache': 'BasicCache',
+    '1-fifo_cache': 'FIFOCache',
+    '2-lifo_cache': 'LIFOCache',
+    '3-lru_cache': 'LRUCache',
+    '4-mru_cache': 'MRUCache',
+    '100-lfu_cache': 'LFUCache',
+    '101-arc_cache': 'ARCCache',
+    '102-tinylfu_cache': 'WTinyLFUCache',
+    '103-clock_cache': 'ClockCache',
+}
+OPTIONS = {
+    'items': {},
+    'bytes': {'max_bytes': 1 << 40},
+    'ttl': {'default_ttl': 3600},
+    'stats': {'stats': True},
+}
+
+
+def bytes_per_entry(policy, entries, options):
+    """Returns the traced bytes per entry of a cache filled to capacity."""
+    keys = [str(key) for key in range(entries)]
+    tracemalloc.start()
+    cache = policy(max_items=entries, on_evict=None, **options)
+    for key in keys:
+        cache.put(key, key)
+    for key in keys[::3]:
+        cache.get(key)
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    report = cache.get_stats()
+    if 'bytes' in report:
+        assert report['bytes'] == sum(map(sys.getsizeof,
+                                          cache.cache_data.values()))
+    del cache
+    return traced / entries
+
+
+if __name__ == "__main__":
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"bytes per entry, {entries} entries")
+    print(f"{'policy':>14}" + "".join(f"{name:>8}" for name in OPTIONS))
+    for module, name in POLICIES.items():
+        policy = getattr(__import__(module), name)
+        sizes = [bytes_per_entry(policy, entries, options)
+                 for options in OPTIONS.values()]
+        print(f"{name:>14}" + "".join(f"{size:>8.0f}" for size in sizes))
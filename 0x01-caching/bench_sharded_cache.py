@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Multithreaded throughput benchmark for ShardedCache.
+
+Every thread replays the same 80% get / 20% put mix over a shared key space.
+The baseline wraps one cache in a single global lock; it is compared with
+ShardedCache over 1, 4, 16 and 64 shards of the same total capacity.
+On a GIL build the gain from sharding is bounded by the interpreter lock;
+the shard locks mainly remove convoying on the single cache lock.
+
+Usage:
+    ./bench_sharded_cache.py [policy_module] [threads] [operations]
+"""
+
+import functools
+import random
+import sys
+import threading
+import time
+
+ShardedCache = __import__('sharded_cache').ShardedCache
+
+POLICIES = {
+    '1-fifo_cache': 'FIFOCache',
+    '2-lifo_cache': 'LIFOCache',
+    '3-lru_cache': 'LRUCache',
+    '4-mru_cache': 'MRUCache',
+    '100-lfu_cache': 'LFUCache',
+}
+CAPACITY = 4096
+KEYS = 8192
+SHARD_COUNTS = (1, 4, 16, 64)
+
+
+class GlobalLockCache:
+    """One cache behind one lock: the naive way to share a cache."""
+
+    def __init__(self, cache):
+        """Wraps an existing cache."""
+        self.cache = cache
+        self.lock = threading.Lock()
+
+    def put(self, key, item):
+        """Adds an item under the global lock."""
+        with self.lock:
+            self.cache.put(key, item)
+
+    def get(self, key):
+        """Retrieves an item under the global lock."""
+        with self.lock:
+            return self.cache.get(key)
+
+
+def make_policy(module, capacity):
+    """Returns a factory building caches of the given policy and capacity."""
+    policy = getattr(__import__(module), POLICIES[module])
+    return functools.partial(policy, max_items=capacity, on_evict=None)
+
+
+def run(cache, threads, operations):
+    """Returns the operations per second achieved by `threads` workers."""
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(seed):
+        rand = random.Random(seed)
+        ops = [(rand.random() < 0.8, rand.randrange(KEYS))
+               for _ in range(operations)]
+        barrier.wait()
+        for is_get, key in ops:
+            if is_get:
+                cache.get(key)
+            else:
+                cache.put(key, key)
+
+    workers = [threading.Thread(target=worker, args=(seed,))
+               for seed in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return threads * operations / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    module = sys.argv[1] if len(sys.argv) > 1 else '3-lru_cache'
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    operations = int(sys.argv[3]) if len(sys.argv) > 3 else 50_000
+    results = [("global lock",
+                run(GlobalLockCache(make_policy(module, CAPACITY)()),
+                    threads, operations))]
+    for count in SHARD_COUNTS:
+        policy = make_policy(module, CAPACITY // count)
+        results.append((f"{count} shards",
+                        run(ShardedCache(policy, count), threads,
+                            operations)))
+    print(f"{POLICIES[module]}, {threads} threads, "
+          f"{operations} ops per thread")
+    for name, ops_per_sec in results:
+        print(f"{name:>12} {ops_per_sec:>12,.0f} ops/s")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Multi-process benchmark of a shared cache against per-worker caches.
+
+Forked workers replay their own Zipf trace over a common key space and read
+through a cache: a `get` miss is followed by a `put`. Each run compares:
+
+    private: every worker has its own LRUCache of `capacity` entries
+    shared:  all workers use one SharedMemoryCache of `capacity` entries
+    shared xN: one SharedMemoryCache as large as all private caches together
+
+Reported per run are the hit ratio over all workers and, from
+/proc/self/status, the memory each worker gained privately (RssAnon) and
+the shared memory it mapped (RssShmem).
+
+Usage:
+    ./bench_shm_cache.py [workers] [capacity] [accesses_per_worker]
+"""
+
+import functools
+import multiprocessing
+import sys
+
+LRUCache = __import__('3-lru_cache').LRUCache
+SharedMemoryCache = __import__('shm_cache').SharedMemoryCache
+zipf_trace = __import__('trace_replay').zipf_trace
+
+VALUE = "x" * 100
+
+
+def memory_kib():
+    """Returns this process' private and shared resident memory in KiB."""
+    fields = {}
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                name, _, value = line.partition(":")
+                if name.startswith("Rss"):
+                    fields[name] = int(value.split()[0])
+    except OSError:
+        pass
+    return fields.get("RssAnon", 0), fields.get("RssShmem", 0)
+
+
+def worker(make_cache, keys, accesses, seed, results):
+    """Replays one Zipf trace through a cache and reports to `results`."""
+    trace = zipf_trace(accesses, keys, seed=seed)
+    private_before, _ = memory_kib()
+    cache = make_cache()
+    hits = 0
+    for key in trace:
+        if cache.get(key) is None:
+            cache.put(key, VALUE + str(key))
+        else:
+            hits += 1
+    private_after, shared = memory_kib()
+    results.put((hits, private_after - private_before, shared))
+
+
+def run(make_cache, workers, keys, accesses):
+    """Returns the hit ratio and mean private/shared KiB per worker."""
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    processes = [context.Process(target=worker,
+                                 args=(make_cache, keys, accesses, seed,
+                                       results))
+                 for seed in range(workers)]
+    for process in processes:
+        process.start()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    hits = sum(report[0] for report in reports)
+    return (hits / (workers * accesses),
+            sum(report[1] for report in reports) / workers,
+            sum(report[2] for report in reports) / workers)
+
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    capacity = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    accesses = int(sys.argv[3]) if len(sys.argv) > 3 else 200_000
+    keys = capacity * 10
+    shared = SharedMemoryCache(slots=capacity)
+    shared_n = SharedMemoryCache(slots=capacity * workers)
+    setups = {
+        "private": functools.partial(LRUCache, max_items=capacity,
+                                     on_evict=None),
+        "shared": lambda: shared,
+        f"shared x{workers}": lambda: shared_n,
+    }
+    print(f"{workers} workers, {capacity} entries per cache, "
+          f"{accesses} accesses per worker")
+    print(f"{'cache':>12} {'hit ratio':>10} {'private KiB':>12} "
+          f"{'shared KiB':>11}")
+    try:
+        for name, make_cache in setups.items():
+            ratio, private, mapped = run(make_cache, workers, keys,
+                                         accesses)
+            print(f"{name:>12} {ratio:>10.1%} {private:>12.0f} "
+                  f"{mapped:>11.0f}")
+    finally:
+        for cache in (shared, shared_n):
+            cache.close()
+            cache.unlink()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark of cache snapshot and restore times.
+
+A cache of each policy is filled with the given number of entries (string
+keys, short string values), saved with `snapshot`, then restored into a new
+cache of the same policy. Streaming the records alone with `iter_snapshot`
+shows how much of the restore is decoding versus rebuilding the policy.
+
+Usage:
+    ./bench_snapshot.py [entries] [directory]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from cache_snapshot import iter_snapshot
+
+POLICIES = {
+    '3-lru_cache': 'LRUCache',
+    '100-lfu_cache': 'LFUCache',
+    '101-arc_cache': 'ARCCache',
+}
+
+
+def bench(policy, entries, path):
+    """Returns save, stream and restore seconds and the file size."""
+    cache = policy(max_items=entries, on_evict=None)
+    for key in range(entries):
+        cache.put(f"page:{key}", f"value {key}")
+
+    start = time.perf_counter()
+    cache.snapshot(path)
+    saved = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in iter_snapshot(path):
+        pass
+    streamed = time.perf_counter() - start
+
+    restored_cache = policy(max_items=entries, on_evict=None)
+    start = time.perf_counter()
+    restored_cache.restore(path)
+    restored = time.perf_counter() - start
+    assert len(restored_cache.cache_data) == entries
+    return saved, streamed, restored, os.path.getsize(path)
+
+
+if __name__ == "__main__":
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    directory = sys.argv[2] if len(sys.argv) > 2 else tempfile.gettempdir()
+    path = os.path.join(directory, "bench_snapshot.snap")
+    print(f"{entries} entries")
+    print(f"{'policy':>10} {'save s':>8} {'stream s':>9} {'restore s':>10} "
+          f"{'MiB':>6}")
+    try:
+        for module, name in POLICIES.items():
+            policy = getattr(__import__(module), name)
+            saved, streamed, restored, size = bench(policy, entries, path)
+            print(f"{name:>10} {saved:>8.2f} {streamed:>9.2f} "
+                  f"{restored:>10.2f} {size / 2 ** 20:>6.1f}")
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite replaying key traces against every caching policy.
+
+Every `BaseCaching` subclass found in the numbered `*_cache.py` modules of
+this directory is run over each trace. A trace is a list of `(op, key)`
+pairs: a `get` that misses is followed by a `put` of the same key, the way
+callers read through a cache, and a `put` writes directly.
+
+Synthetic traces cover a Zipf working set of tunable skew, the same working
+set interrupted by one-off scans, and a loop slightly larger than the cache;
+`--read-ratio` turns part of their accesses into writes. A recorded trace
+is a text file with one access per line, either `key` or `get key` /
+`put key`.
+
+For each policy and trace the suite reports operations per second, p50 and
+p99 latency per operation, hit ratio and peak traced memory. `--json` saves
+the results, and `--baseline` compares them with a saved run, exiting with
+status 1 when throughput or hit ratio regress beyond `--tolerance` (and 2
+when the baseline was run with other trace parameters).
+
+Usage:
+    ./bench_suite.py [--capacity N] [--length N] [--skew S]
+                     [--read-ratio R] [--trace FILE ...] [--policy NAME ...]
+                     [--json FILE] [--baseline FILE] [--tolerance T]
+"""
+
+import argparse
+import glob
+import inspect
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+
+from base_caching import BaseCaching
+
+trace_replay = __import__('trace_replay')
+
+
+def discover_policies():
+    """Returns every BaseCaching subclass of the numbered cache modules."""
+    policies = {}
+    here = os.path.dirname(os.path.abspath(__file__))
+    for path in sorted(glob.glob(os.path.join(here, "[0-9]*_cache.py"))):
+        module = __import__(os.path.basename(path)[:-3])
+        for name, value in vars(module).items():
+            if inspect.isclass(value) and issubclass(value, BaseCaching) \
+                    and value is not BaseCaching:
+                policies[name] = value
+    return policies
+
+
+def with_ops(keys, read_ratio, seed=0):
+    """Returns a trace of keys as (op, key) pairs with the given reads."""
+    rand = random.Random(seed)
+    return [("get" if rand.random() < read_ratio else "put", key)
+            for key in keys]
+
+
+def load_trace(path):
+    """Returns the (op, key) pairs of a recorded trace file."""
+    trace = []
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) == 1:
+                trace.append(("get", fields[0]))
+            elif len(fields) == 2 and fields[0] in ("get", "put"):
+                trace.append((fields[0], fields[1]))
+    return trace
+
+
+def synthetic_traces(capacity, length, skew, read_ratio):
+    """Returns the synthetic traces keyed by name."""
+    keys = capacity * 10
+    return {
+        f"zipf-{skew}": with_ops(
+            trace_replay.zipf_trace(length, keys, skew=skew), read_ratio),
+        "scan": with_ops(
+            trace_replay.scan_trace(length, keys, capacity * 2,
+                                    length // 10), read_ratio),
+        "loop": with_ops(
+            trace_replay.loop_trace(length, capacity + capacity // 4),
+            read_ratio),
+    }
+
+
+def replay(cache, trace, latencies=None):
+    """Runs a trace and returns its hit and get counts.
+
+    When `latencies` is an array, the duration of every operation, read
+    through included, is appended to it in nanoseconds.
+    """
+    get, put = cache.get, cache.put
+    clock = time.perf_counter_ns
+    hits = gets = 0
+    for op, key in trace:
+        start = clock() if latencies is not None else 0
+        if op == "put":
+            put(key, key)
+        else:
+            gets += 1
+            if get(key) is None:
+                put(key, key)
+            else:
+                hits += 1
+        if latencies is not None:
+            latencies.append(clock() - start)
+    return hits, gets
+
+
+def measure(policy, trace, capacity):
+    """Returns the metrics of one policy over one trace."""
+    def new_cache():
+        return policy(max_items=capacity, on_evict=None)
+
+    start = time.perf_counter()
+    hits, gets = replay(new_cache(), trace)
+    elapsed = time.perf_counter() - start
+
+    latencies = array("Q")
+    replay(new_cache(), trace, latencies)
+    latencies = sorted(latencies)
+
+    tracemalloc.start()
+    cache = new_cache()
+    replay(cache, trace)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del cache
+
+    return {
+        "ops_per_sec": len(trace) / elapsed,
+        "p50_ns": latencies[len(latencies) // 2],
+        "p99_ns": latencies[min(len(latencies) - 1,
+                                len(latencies) * 99 // 100)],
+        "hit_ratio": hits / gets if gets else 0.0,
+        "peak_bytes": peak,
+    }
+
+
+def regressions(results, baseline, tolerance):
+    """Returns descriptions of metrics worse than the baseline."""
+    found = []
+    for policy, traces in results.items():
+        for name, metrics in traces.items():
+            before = baseline.get(policy, {}).get(name)
+            if before is None:
+                continue
+            for metric in ("ops_per_sec", "hit_ratio"):
+                if metrics[metric] < before[metric] * (1 - tolerance):
+                    found.append(f"{policy} {name} {metric}: "
+                                 f"{metrics[metric]:.4g} < "
+                                 f"{before[metric]:.4g}")
+    return found
+
+
+def main(argv=None):
+    """Runs the suite from the command line and returns the exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--capacity", type=int, default=1000)
+    parser.add_argument("--length", type=int, default=100_000)
+    parser.add_argument("--skew", type=float, default=0.99)
+    parser.add_argument("--read-ratio", type=float, default=1.0)
+    parser.add_argument("--trace", action="append", default=[])
+    parser.add_argument("--policy", action="append", default=[])
+    parser.add_argument("--json")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    params = {"capacity": args.capacity, "length": args.length,
+              "skew": args.skew, "read_ratio": args.read_ratio}
+    policies = discover_policies()
+    if args.policy:
+        policies = {name: policies[name] for name in args.policy}
+    traces = synthetic_traces(args.capacity, args.length, args.skew,
+                              args.read_ratio)
+    for path in args.trace:
+        traces[os.path.basename(path)] = load_trace(path)
+
+    print(f"{'policy':>14} {'trace':>12} {'ops/s':>11} {'p50 ns':>8} "
+          f"{'p99 ns':>8} {'hits':>7} {'peak KiB':>9}")
+    results = {}
+    for policy_name, policy in policies.items():
+        results[policy_name] = {}
+        for trace_name, trace in traces.items():
+            metrics = measure(policy, trace, args.capacity)
+            results[policy_name][trace_name] = metrics
+            print(f"{policy_name:>14} {trace_name:>12} "
+                  f"{metrics['ops_per_sec']:>11,.0f} "
+                  f"{metrics['p50_ns']:>8} {metrics['p99_ns']:>8} "
+                  f"{metrics['hit_ratio']:>7.1%} "
+                  f"{metrics['peak_bytes'] / 1024:>9.0f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"params": params, "results": results}, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["params"] != params:
+            print(f"baseline was run with {baseline['params']}",
+                  file=sys.stderr)
+            return 2
+        found = regressions(results, baseline["results"], args.tolerance)
+        for line in found:
+            print(f"REGRESSION: {line}", file=sys.stderr)
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
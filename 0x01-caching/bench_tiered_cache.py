@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark of a memory L1 cache in front of a disk L2 cache.
+
+A Zipf trace over ten times the L1 capacity is read through the cache: a
+miss is followed by a `put`. The same trace is replayed against L1 alone
+and against L1 backed by an L2 ten times larger, reporting the hit rate of
+each tier and the latency of lookups in each tier.
+
+Usage:
+    ./bench_tiered_cache.py [l1_capacity] [accesses] [directory]
+"""
+
+import os
+import sys
+import tempfile
+
+LRUCache = __import__('3-lru_cache').LRUCache
+TieredCache = __import__('tiered_cache').TieredCache
+zipf_trace = __import__('trace_replay').zipf_trace
+
+
+def replay(cache, trace):
+    """Reads every key of the trace through the cache."""
+    for key in trace:
+        if cache.get(key) is None:
+            cache.put(key, f"page {key}")
+
+
+if __name__ == "__main__":
+    capacity = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    accesses = int(sys.argv[2]) if len(sys.argv) > 2 else 300_000
+    directory = sys.argv[3] if len(sys.argv) > 3 else tempfile.gettempdir()
+    trace = zipf_trace(accesses, capacity * 10, skew=0.8)
+    path = os.path.join(directory, "bench_tiered_cache.db")
+
+    alone = LRUCache(max_items=capacity, on_evict=None, stats=True)
+    replay(alone, trace)
+    tiered = TieredCache(LRUCache(max_items=capacity, on_evict=None), path,
+                         l2_max_items=capacity * 10)
+    try:
+        replay(tiered, trace)
+        stats = tiered.get_stats()
+    finally:
+        tiered.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    print(f"L1 {capacity} items, L2 {capacity * 10} items, "
+          f"{accesses} accesses")
+    print(f"L1 alone: hit rate {alone.stats.hit_ratio:.1%}")
+    print(f"L1 + L2:  L1 hit rate {stats['l1_hit_rate']:.1%}, "
+          f"L2 hit rate {stats['l2_hit_rate']:.1%}, "
+          f"{stats['demotions']} demotions")
+    for tier, latency in stats["latency"].items():
+        print(f"{tier} lookup: mean {latency['mean_ns'] / 1000:.1f} us, "
+              f"p50 <= {latency['p50_ns'] / 1000:.1f} us, "
+              f"p99 <= {latency['p99_ns'] / 1000:.1f} us")
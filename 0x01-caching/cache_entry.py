@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Compact cache entry module.
+
+This module defines `CacheEntry`, a `__slots__` node carrying the per-key
+bookkeeping of a policy, and `EntryList`, an intrusive doubly linked list of
+such nodes. A node is a single small object with no instance dictionary, so
+a policy that needs both an order and a counter per key pays for one object
+instead of one slot in each of several dictionaries.
+"""
+
+
+class CacheEntry:
+    """
+    The bookkeeping node of one cached key.
+    """
+
+    __slots__ = ("key", "freq", "prev", "next")
+
+    def __init__(self, key, freq=1):
+        """
+        Initialize an unlinked entry.
+
+        Args:
+            key: The cached key.
+            freq (int): The access frequency of the key.
+        """
+        self.key = key
+        self.freq = freq
+        self.prev = None
+        self.next = None
+
+
+class EntryList:
+    """
+    A doubly linked list of entries, oldest first, with O(1) updates.
+    """
+
+    __slots__ = ("head", "size")
+
+    def __init__(self):
+        """
+        Initialize an empty list around a sentinel node.
+        """
+        self.head = CacheEntry(None, 0)
+        self.head.prev = self.head.next = self.head
+        self.size = 0
+
+    def __len__(self):
+        """
+        Return the number of linked entries.
+        """
+        return self.size
+
+    def __iter__(self):
+        """
+        Iterate over the entries, oldest first.
+        """
+        node = self.head.next
+        while node is not self.head:
+            following = node.next
+            yield node
+            node = following
+
+    def append(self, node):
+        """
+        Link an entry at the newest end.
+        """
+        last = self.head.prev
+        node.prev = last
+        node.next = self.head
+        last.next = node
+        self.head.prev = node
+        self.size += 1
+
+    def remove(self, node):
+        """
+        Unlink an entry.
+        """
+        node.prev.next = node.next
+        node.next.prev = node.prev
+        node.prev = node.next = None
+        self.size -= 1
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""A read-through caching module.
+
+This module defines a `LoadingCache` class that wraps any cache exposing
+`get` and `put` and computes missing values itself through `get_or_load`.
+Concurrent misses for the same key share a single in-flight load: the first
+caller runs the loader and the others wait for its result, so a cold hot key
+costs one computation instead of one per caller. `aget_or_load` does the same
+for coroutines on an asyncio event loop.
+
+With `stale_ttl`, a value past its `ttl` is still served for `stale_ttl` more
+seconds while a single refresh runs in the background.
+
+Hits read the wrapped cache without taking any lock of the front; the lock
+is only taken on a miss or a stale value, to join or start the load. Shared
+by several threads, the wrapped cache must therefore be thread-safe itself,
+like a `ShardedCache`.
+"""
+
+import asyncio
+import threading
+import time
+
+
+class _Load:
+    """
+    The outcome of one in-flight load, shared by every caller waiting on it.
+    """
+
+    __slots__ = ("done", "item", "error")
+
+    def __init__(self):
+        """
+        Initialize a pending load.
+        """
+        self.done = threading.Event()
+        self.item = None
+        self.error = None
+
+    def result(self):
+        """
+        Wait for the load, then return its item or raise its error.
+        """
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.item
+
+
+class LoadingCache:
+    """
+    A read-through front that coalesces concurrent loads of the same key.
+    """
+
+    def __init__(self, cache, ttl=None, stale_ttl=None):
+        """
+        Initialize the loading cache.
+
+        Args:
+            cache: The cache storing loaded values, e.g. an `LRUCache`, or a
+            `ShardedCache` when used from several threads.
+            ttl (float): Seconds a loaded value is fresh; defaults to the
+            cache's own expiry.
+            stale_ttl (float): Seconds a value past `ttl` may still be
+            served while it is refreshed. Requires `ttl`.
+        """
+        assert stale_ttl is None or ttl is not None
+        self.cache = cache
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.clock = getattr(cache, "clock", time.monotonic)
+        self._lock = threading.Lock()
+        self._loads = {}
+        self._async_loads = {}
+        self._refreshes = set()
+
+    def get_or_load(self, key, loader):
+        """
+        Return the cached value of a key, loading it on a miss.
+
+        Args:
+            key: The key to look up.
+            loader (callable): Called with the key to compute a missing
+            value. Only one call runs at a time per key; its result, or its
+            exception, is shared by all callers waiting on it.
+
+        Returns:
+            The cached or loaded value. A loader returning None is not
+            cached.
+        """
+        item, stale = self._lookup(key)
+        if item is not None and not stale:
+            return item
+        with self._lock:
+            # A load may have finished since the lookup above
+            item, stale = self._lookup(key)
+            if item is not None and not stale:
+                return item
+            load = self._loads.get(key)
+            owner = load is None
+            if owner:
+                load = self._loads[key] = _Load()
+        if item is not None:
+            # Serve the stale value while a single refresh runs
+            if owner:
+                threading.Thread(target=self._run, daemon=True,
+                                 args=(key, loader, load)).start()
+            return item
+        if owner:
+            self._run(key, loader, load)
+        return load.result()
+
+    async def aget_or_load(self, key, loader):
+        """
+        Return the cached value of a key, awaiting a coroutine on a miss.
+
+        Args:
+            key: The key to look up.
+            loader (callable): Called with the key, returns an awaitable of
+            the missing value. Only one load runs at a time per key.
+
+        Returns:
+            The cached or loaded value. A loader returning None is not
+            cached.
+        """
+        # Nothing runs on the loop between the lookup and the registration
+        # below, so no load can finish in between and no lock is needed
+        item, stale = self._lookup(key)
+        if item is not None and not stale:
+            return item
+        future = self._async_loads.get(key)
+        owner = future is None
+        if owner:
+            future = asyncio.get_running_loop().create_future()
+            self._async_loads[key] = future
+            task = asyncio.ensure_future(self._arun(key, loader, future))
+            if item is not None:
+                self._refreshes.add(task)
+                task.add_done_callback(self._refreshes.discard)
+        if item is not None:
+            return item
+        return await asyncio.shield(future)
+
+    def _lookup(self, key):
+        """
+        Return the cached value of a key and whether it is stale.
+        """
+        cached = self.cache.get(key)
+        if cached is None or self.stale_ttl is None:
+            return cached, False
+        item, fresh_until = cached
+        return item, fresh_until <= self.clock()
+
+    def _store(self, key, item):
+        """
+        Cache a loaded value, with its freshness deadline if needed.
+        """
+        if item is None:
+            return
+        if self.stale_ttl is None:
+            self.cache.put(key, item, self.ttl)
+        else:
+            self.cache.put(key, (item, self.clock() + self.ttl),
+                           self.ttl + self.stale_ttl)
+
+    def _run(self, key, loader, load):
+        """
+        Run a load in the calling thread and publish its outcome.
+        """
+        try:
+            load.item = loader(key)
+        except Exception as error:
+            load.error = error
+        with self._lock:
+            if load.error is None:
+                self._store(key, load.item)
+            del self._loads[key]
+        load.done.set()
+
+    async def _arun(self, key, loader, future):
+        """
+        Await a load on the event loop and publish its outcome.
+        """
+        try:
+            item = await loader(key)
+        except Exception as error:
+            future.set_exception(error)
+            # Nobody may await a failed background refresh
+            future.exception()
+        else:
+            self._store(key, item)
+            future.set_result(item)
+        finally:
+            del self._async_loads[key]
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""Cache persistence module.
+
+This module saves a cache to a local file and restores it, so a restarted
+process starts warm. A snapshot keeps the policy state: entries are written
+in the order that rebuilds recency lists and frequency buckets when replayed,
+along with each entry's policy metadata and remaining time to live.
+
+A snapshot file is a magic header, the pickled policy-wide state, then
+length-prefixed chunks of pickled entry records. Chunks are decoded one at a
+time straight from a memory map, so `iter_snapshot` streams a large snapshot
+without reading it whole.
+
+`CacheJournal` adds an append-only log of writes between two snapshots,
+flushed every `flush_interval` seconds, so a crash only loses the writes of
+the last interval.
+"""
+
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+
+MAGIC = b"CACHESNAP1\n"
+LENGTH = struct.Struct("<I")
+CHUNK_SIZE = 4096
+
+
+def _frame(payload):
+    """
+    Return a payload prefixed with its length.
+    """
+    return LENGTH.pack(len(payload)) + payload
+
+
+def _frames(buffer, offset):
+    """
+    Yield the payloads framed in a buffer from an offset.
+
+    A truncated last frame, left by a crash during a write, is ignored.
+    """
+    end = len(buffer)
+    while offset + LENGTH.size <= end:
+        length, = LENGTH.unpack_from(buffer, offset)
+        offset += LENGTH.size
+        if offset + length > end:
+            return
+        yield buffer[offset:offset + length]
+        offset += length
+
+
+def _wall_deadline(cache, key):
+    """
+    Return the wall-clock expiry of a cached key, or None if it has none.
+    """
+    deadline = cache._expires.get(key)
+    if deadline is None:
+        return None
+    return time.time() + deadline - cache.clock()
+
+
+def save_snapshot(cache, path):
+    """
+    Write the content and policy state of a cache to a file.
+
+    The file is written next to `path` and renamed over it, so a crash
+    never leaves a half-written snapshot behind.
+
+    Args:
+        cache (BaseCaching): The cache to save.
+        path (str): The snapshot file.
+
+    Returns:
+        int: The number of entries written.
+    """
+    cache.expire()
+    data = cache.cache_data
+    tmp_path = path + ".tmp"
+    count = 0
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_frame(pickle.dumps(cache._snapshot_state(),
+                                    pickle.HIGHEST_PROTOCOL)))
+        chunk = []
+        for key, meta in cache._snapshot_entries():
+            chunk.append((key, data[key], _wall_deadline(cache, key), meta))
+            if len(chunk) == CHUNK_SIZE:
+                f.write(_frame(pickle.dumps(chunk, pickle.HIGHEST_PROTOCOL)))
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            f.write(_frame(pickle.dumps(chunk, pickle.HIGHEST_PROTOCOL)))
+            count += len(chunk)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return count
+
+
+def iter_snapshot(path):
+    """
+    Stream the records of a snapshot file through a memory map.
+
+    Args:
+        path (str): The snapshot file.
+
+    Yields:
+        The policy-wide state first, then one `(key, item, wall_deadline,
+        meta)` tuple per entry, from the first to discard to the last.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"{path} is not a cache snapshot")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            if view[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a cache snapshot")
+            frames = _frames(view, len(MAGIC))
+            yield pickle.loads(next(frames))
+            for payload in frames:
+                yield from pickle.loads(payload)
+
+
+def load_snapshot(cache, path):
+    """
+    Fill an empty cache from a snapshot file.
+
+    Entries that expired since the snapshot are skipped. If the cache is
+    smaller than the snapshot, the usual evictions apply while loading.
+
+    Args:
+        cache (BaseCaching): A cache of the policy that wrote the snapshot.
+        path (str): The snapshot file.
+
+    Returns:
+        int: The number of entries restored.
+    """
+    assert not cache.cache_data, "restore into an empty cache"
+    records = iter_snapshot(path)
+    cache._restore_state(next(records))
+    count = 0
+    for record in records:
+        if _restore_record(cache, *record):
+            count += 1
+    return count
+
+
+def _restore_record(cache, key, item, wall_deadline, meta=None):
+    """
+    Add one saved entry to a cache, unless it has expired since.
+    """
+    ttl = None
+    if wall_deadline is not None:
+        ttl = wall_deadline - time.time()
+        if ttl <= 0:
+            return False
+    size = cache._item_size(item)
+    if not cache._reserve(key, size):
+        return False
+    restored = key in cache.cache_data
+    cache._store(key, item, size, ttl)
+    if not restored:
+        cache._restore_entry(key, meta)
+    return True
+
+
+class CacheJournal:
+    """
+    A cache front that logs every write to an append-only journal.
+
+    Puts and get hits are logged, and replayed through the cache's own `put`
+    and `get` on recovery, so evictions and recency come out as they were.
+    Like the caches it wraps, a journal is not thread-safe by itself.
+    """
+
+    def __init__(self, cache, path, flush_interval=1.0):
+        """
+        Initialize the journal and start flushing it periodically.
+
+        Args:
+            cache (BaseCaching): The journaled cache.
+            path (str): The journal file; checkpoints are written to
+            `path + ".snap"`.
+            flush_interval (float): Seconds between two flushes, which is
+            the most a crash can lose.
+        """
+        self.cache = cache
+        self.path = path
+        self.snapshot_path = path + ".snap"
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending = []
+        self._file = open(path, "ab")
+        self._stopped = threading.Event()
+        threading.Thread(target=self._flush_loop, daemon=True).start()
+
+    def recover(self):
+        """
+        Rebuild the cache from the last checkpoint and the journal after it.
+
+        Returns:
+            int: The number of journal records replayed.
+        """
+        if os.path.exists(self.snapshot_path):
+            load_snapshot(self.cache, self.snapshot_path)
+        with open(self.path, "rb") as f:
+            log = f.read()
+        count = 0
+        for payload in _frames(log, 0):
+            key, item, wall_deadline = pickle.loads(payload)
+            count += 1
+            if item is None:
+                self.cache.get(key)
+                continue
+            ttl = None
+            if wall_deadline is not None:
+                ttl = wall_deadline - time.time()
+                if ttl <= 0:
+                    continue
+            self.cache.put(key, item, ttl)
+        return count
+
+    def put(self, key, item, ttl=None):
+        """
+        Add an item to the cache and log it.
+        """
+        self.cache.put(key, item, ttl)
+        if key in self.cache.cache_data:
+            self._log(key, item, _wall_deadline(self.cache, key))
+
+    def get(self, key):
+        """
+        Retrieve an item, logging the hit so recency survives a restart.
+        """
+        item = self.cache.get(key)
+        if item is not None:
+            self._log(key, None, None)
+        return item
+
+    def flush(self):
+        """
+        Write the pending records to disk.
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            self._file.write(b"".join(self._pending))
+            self._pending = []
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def checkpoint(self):
+        """
+        Snapshot the cache and start a new, empty journal.
+        """
+        with self._lock:
+            save_snapshot(self.cache, self.snapshot_path)
+            self._pending = []
+            self._file.truncate(0)
+
+    def close(self):
+        """
+        Flush the journal and stop the flushing thread.
+        """
+        self._stopped.set()
+        self.flush()
+        self._file.close()
+
+    def _log(self, key, item, wall_deadline):
+        """
+        Queue one journal record until the next flush.
+        """
+        record = pickle.dumps((key, item, wall_deadline),
+                              pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._pending.append(_frame(record))
+
+    def _flush_loop(self):
+        """
+        Flush the journal every `flush_interval` seconds.
+        """
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Cache instrumentation module.
+
+This module defines the counters and latency histograms a cache keeps when
+it is built with `stats=True` or `latency=True`, and the eviction callbacks
+a cache can report discarded keys to.
+
+Instrumentation is attached per instance by wrapping `get` and `put`, so a
+cache built without it runs exactly the uninstrumented code.
+"""
+
+import logging
+import time
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+
+def print_discard(key, reason):
+    """
+    Print capacity evictions the way the caching exercises expect.
+
+    Args:
+        key: The evicted key.
+        reason (str): Why it was evicted: capacity, expired or oversize.
+    """
+    if reason == "capacity":
+        print(f"DISCARD: {key}")
+
+
+def log_discard(key, reason):
+    """
+    Log every eviction at debug level instead of printing it.
+
+    Args:
+        key: The evicted key.
+        reason (str): Why it was evicted: capacity, expired or oversize.
+    """
+    logger.debug("DISCARD: %s (%s)", key, reason)
+
+
+class LatencyHistogram:
+    """
+    A histogram of durations in nanoseconds with power-of-two buckets.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty histogram.
+        """
+        self.buckets = [0] * 64
+        self.count = 0
+        self.total_ns = 0
+
+    def record(self, duration_ns):
+        """
+        Add one duration.
+
+        Args:
+            duration_ns (int): A duration in nanoseconds.
+        """
+        self.buckets[min(duration_ns.bit_length(), 63)] += 1
+        self.count += 1
+        self.total_ns += duration_ns
+
+    def percentile(self, fraction):
+        """
+        Return an upper bound of the given percentile.
+
+        Args:
+            fraction (float): The percentile as a fraction, e.g. 0.99.
+
+        Returns:
+            int: The upper edge in nanoseconds of the bucket holding it.
+        """
+        if not self.count:
+            return 0
+        rank = fraction * self.count
+        seen = 0
+        for bits, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return 1 << bits
+        return 1 << 63
+
+    def as_dict(self):
+        """
+        Return the count, mean and main percentiles of the histogram.
+        """
+        return {
+            "count": self.count,
+            "mean_ns": self.total_ns / self.count if self.count else 0,
+            "p50_ns": self.percentile(0.5),
+            "p99_ns": self.percentile(0.99),
+        }
+
+
+class CacheStats:
+    """
+    Counters describing how a cache has been used.
+    """
+
+    def __init__(self, latency=False):
+        """
+        Initialize zeroed counters.
+
+        Args:
+            latency (bool): Also keep a latency histogram per operation.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.inserts = 0
+        self.updates = 0
+        self.evictions = Counter()
+        self.latency = None
+        if latency:
+            self.latency = {"get": LatencyHistogram(),
+                            "put": LatencyHistogram()}
+
+    @property
+    def hit_ratio(self):
+        """
+        Return the share of `get` calls that were hits.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self):
+        """
+        Return the counters as a plain dictionary.
+        """
+        report = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio,
+            "inserts": self.inserts,
+            "updates": self.updates,
+            "evictions": dict(self.evictions),
+        }
+        if self.latency is not None:
+            report["latency"] = {operation: histogram.as_dict()
+                                 for operation, histogram
+                                 in self.latency.items()}
+        return report
+
+
+def instrument(cache):
+    """
+    Replace the `get` and `put` of a cache with counting versions.
+
+    Args:
+        cache (BaseCaching): A cache whose `stats` attribute is set.
+    """
+    stats = cache.stats
+    get, put = cache.get, cache.put
+
+    def counted_get(key):
+        item = get(key)
+        if item is None:
+            stats.misses += 1
+        else:
+            stats.hits += 1
+        return item
+
+    def counted_put(key, item, ttl=None):
+        cached = key in cache.cache_data
+        put(key, item, ttl)
+        if key is not None and item is not None and key in cache.cache_data:
+            if cached:
+                stats.updates += 1
+            else:
+                stats.inserts += 1
+
+    if stats.latency is None:
+        cache.get, cache.put = counted_get, counted_put
+        return
+
+    get_histogram = stats.latency["get"]
+    put_histogram = stats.latency["put"]
+    clock = time.perf_counter_ns
+
+    def timed_get(key):
+        start = clock()
+        item = counted_get(key)
+        get_histogram.record(clock() - start)
+        return item
+
+    def timed_put(key, item, ttl=None):
+        start = clock()
+        counted_put(key, item, ttl)
+        put_histogram.record(clock() - start)
+
+    cache.get, cache.put = timed_get, timed_put
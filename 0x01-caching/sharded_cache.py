@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""A thread-safe, sharded caching module.
+
+This module defines a `ShardedCache` class that spreads keys over several
+independent caches of any `BaseCaching` policy. Each shard is guarded by its
+own lock, so the check-then-evict-then-insert sequence of `put` and the
+bookkeeping done by `get` are atomic per shard, while threads working on
+keys that live in different shards never wait on each other.
+
+Attributes:
+    shards (list): The underlying cache instances, one per shard.
+"""
+
+import threading
+
+
+class ShardedCache:
+    """
+    A caching system that partitions keys across locked sub-caches.
+    """
+
+    def __init__(self, factory, shards=16):
+        """
+        Initialize the sharded cache.
+
+        Args:
+            factory (callable): Called with no arguments to build each shard,
+            e.g. `functools.partial(LRUCache, max_items=256)`. Eviction is
+            applied per shard, so the total capacity is the shard count
+            times the capacity of one shard.
+            shards (int): Number of shards; 1 behaves as a single global lock.
+        """
+        assert isinstance(shards, int) and shards > 0
+        self.shards = [factory() for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+
+    def _shard_index(self, key):
+        """
+        Return the index of the shard responsible for a key.
+
+        Args:
+            key: A hashable cache key.
+
+        Returns:
+            int: A shard index.
+        """
+        return hash(key) % len(self.shards)
+
+    def put(self, key, item, ttl=None):
+        """
+        Add an item to the shard owning the key.
+
+        Args:
+            key: The key for the cache entry.
+            item: The value to be stored in the cache.
+            ttl (float): Seconds the entry lives; defaults to the shard's
+            default_ttl.
+
+        Notes:
+            If key or item is None, this method does nothing.
+        """
+        if key is None or item is None:
+            return
+        index = self._shard_index(key)
+        with self._locks[index]:
+            self.shards[index].put(key, item, ttl)
+
+    def get(self, key):
+        """
+        Retrieve an item from the shard owning the key.
+
+        Args:
+            key: The key to look up in the cache.
+
+        Returns:
+            The value associated with the key, or None if not found.
+        """
+        if key is None:
+            return None
+        index = self._shard_index(key)
+        with self._locks[index]:
+            return self.shards[index].get(key)
+
+    def get_many(self, keys):
+        """
+        Retrieve several items, locking each involved shard once.
+
+        Args:
+            keys (iterable): The keys to look up.
+
+        Returns:
+            dict: The cached items of the keys that were found.
+        """
+        found = {}
+        for index, shard_keys in self._group(keys).items():
+            with self._locks[index]:
+                found.update(self.shards[index].get_many(shard_keys))
+        return found
+
+    def put_many(self, mapping, ttl=None):
+        """
+        Add several items, locking each involved shard once.
+
+        Args:
+            mapping (dict): The items to cache, by key.
+            ttl (float): Seconds the entries live; defaults to the shard's
+            default_ttl.
+        """
+        for index, shard_keys in self._group(mapping).items():
+            with self._locks[index]:
+                self.shards[index].put_many(
+                    {key: mapping[key] for key in shard_keys}, ttl)
+
+    def _group(self, keys):
+        """
+        Split keys by the index of the shard owning them, keeping order.
+        """
+        groups = {}
+        for key in keys:
+            if key is not None:
+                groups.setdefault(self._shard_index(key), []).append(key)
+        return groups
+
+    def start_sweeper(self, interval):
+        """
+        Expire due entries of every shard from a daemon thread.
+
+        Each shard is swept under its own lock, so the sweeper never blocks
+        more than one shard at a time.
+
+        Args:
+            interval (float): Seconds between two sweeps.
+
+        Returns:
+            threading.Event: Set it to stop the sweeper.
+        """
+        stopped = threading.Event()
+
+        def sweep():
+            while not stopped.wait(interval):
+                for lock, shard in zip(self._locks, self.shards):
+                    with lock:
+                        shard.expire()
+
+        threading.Thread(target=sweep, daemon=True).start()
+        return stopped
+
+    def __len__(self):
+        """
+        Return the number of items cached across all shards.
+        """
+        return sum(len(shard.cache_data) for shard in self.shards)
+
+    def print_cache(self):
+        """
+        Print the content of every shard, sorted by key.
+        """
+        items = {}
+        for lock, shard in zip(self._locks, self.shards):
+            with lock:
+                items.update(shard.cache_data)
+        print("Current cache:")
+        for key in sorted(items):
+            print("{}: {}".format(key, items[key]))
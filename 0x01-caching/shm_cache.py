@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""A cross-process shared-memory caching module.
+
+This module defines a `SharedMemoryCache` class whose entries live in a
+`multiprocessing.shared_memory` block, so the pre-forked workers of one host
+share a single cache instead of each filling its own copy.
+
+The block is a fixed table of equal-sized slots grouped into small sets.
+A key is hashed to one set and may only live in the `ways` slots of that
+set, so finding a key never looks at more than `ways` slots. Each set is
+evicted with the CLOCK algorithm: a hit sets the slot's reference bit, and
+the set's clock hand skips (and clears) referenced slots until it finds a
+victim. Sets are guarded by a fixed number of striped locks, so workers
+touching different stripes never wait on each other.
+
+Keys and values are pickled into their slot; an entry whose pickle does not
+fit in a slot is not cached. An entry put with a `ttl` stores its wall-clock
+deadline, which every process can compare against, and is dropped when it
+is read after it. Key hashes use BLAKE2b rather than `hash()`,
+whose string hashing differs between interpreter processes.
+
+Attributes:
+    shm (SharedMemory): The shared block holding the table.
+"""
+
+import hashlib
+import multiprocessing
+import pickle
+import struct
+import time
+from multiprocessing import shared_memory
+
+# Block geometry, so attaching processes need only the name
+TABLE_HEADER = struct.Struct("<4sIII")
+MAGIC = b"SHMC"
+# Per slot: key hash, flags, payload length, deadline (0 for none)
+SLOT_HEADER = struct.Struct("<QBxxxId")
+USED = 1
+REFERENCED = 2
+
+
+class SharedMemoryCache:
+    """
+    A set-associative CLOCK cache stored in shared memory.
+    """
+
+    def __init__(self, name=None, slots=4096, slot_size=256, ways=8,
+                 stripes=64, create=True, locks=None):
+        """
+        Create or attach to a shared cache.
+
+        Args:
+            name (str): Name of the shared memory block; generated when
+            creating without one.
+            slots (int): Number of entries the cache can hold, rounded up to
+            a whole number of sets. Ignored when attaching.
+            slot_size (int): Bytes per slot, including a 24-byte header.
+            Ignored when attaching.
+            ways (int): Slots per set, below 256. Ignored when attaching.
+            stripes (int): Number of locks the sets are spread over.
+            create (bool): Create the block, or attach to an existing one.
+            locks (list): The striped locks of an existing cache. Workers
+            forked after the cache was created inherit them; processes
+            attaching by name must be handed the same locks.
+        """
+        if create:
+            assert slot_size > SLOT_HEADER.size and 0 < ways < 256
+            sets = -(-slots // ways)
+            size = TABLE_HEADER.size + sets + sets * ways * slot_size
+            self.shm = shared_memory.SharedMemory(name=name, create=True,
+                                                  size=size)
+            self.shm.buf[:size] = bytes(size)
+            TABLE_HEADER.pack_into(self.shm.buf, 0, MAGIC, sets, ways,
+                                   slot_size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        magic, self.sets, self.ways, self.slot_size = \
+            TABLE_HEADER.unpack_from(self.shm.buf, 0)
+        assert magic == MAGIC, f"{self.shm.name} is not a shared cache"
+        self.payload_size = self.slot_size - SLOT_HEADER.size
+        self.locks = locks or [multiprocessing.Lock()
+                               for _ in range(stripes)]
+        # Clock hands, one byte per set, precede the slot table. Both are
+        # addressed by offset: a slice of shm.buf would be an exported
+        # buffer, which keeps the block from being closed.
+        self._hands_at = TABLE_HEADER.size
+        self._table_at = TABLE_HEADER.size + self.sets
+
+    @property
+    def name(self):
+        """
+        Return the name other processes attach to.
+        """
+        return self.shm.name
+
+    def __enter__(self):
+        """
+        Return the cache, to be closed when the block exits.
+        """
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Detach this process from the shared block.
+        """
+        self.close()
+
+    def put(self, key, item, ttl=None):
+        """
+        Add an item to the set of its key, evicting with CLOCK if full.
+
+        Args:
+            key: The key for the cache entry; must be picklable.
+            item: The value to be stored in the cache; must be picklable.
+            ttl (float): Seconds the entry lives. Entries never expire by
+            default.
+
+        Notes:
+            If key or item is None, or the pickled entry does not fit in a
+            slot, this method does nothing.
+        """
+        if key is None or item is None:
+            return
+        payload = pickle.dumps((key, item), pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.payload_size:
+            return
+        deadline = time.time() + ttl if ttl is not None else 0.0
+        key_hash = self._hash(key)
+        index = key_hash % self.sets
+        with self.locks[index % len(self.locks)]:
+            slot = self._find(index, key_hash, key)
+            if slot is None:
+                slot = self._free_slot(index)
+            offset = self._offset(slot)
+            buf = self.shm.buf
+            SLOT_HEADER.pack_into(buf, offset, key_hash, USED | REFERENCED,
+                                  len(payload), deadline)
+            start = offset + SLOT_HEADER.size
+            buf[start:start + len(payload)] = payload
+
+    def get(self, key):
+        """
+        Retrieve an item and mark its slot as referenced.
+
+        Args:
+            key: The key to look up in the cache.
+
+        Returns:
+            The value associated with the key, or None if not found or
+            expired.
+        """
+        if key is None:
+            return None
+        key_hash = self._hash(key)
+        index = key_hash % self.sets
+        with self.locks[index % len(self.locks)]:
+            slot = self._find(index, key_hash, key)
+            if slot is None:
+                return None
+            offset = self._offset(slot)
+            buf = self.shm.buf
+            deadline = SLOT_HEADER.unpack_from(buf, offset)[3]
+            if deadline and deadline <= time.time():
+                buf[offset + 8] = 0
+                return None
+            buf[offset + 8] |= REFERENCED
+            return self._read(offset)[1]
+
+    def __len__(self):
+        """
+        Return the number of cached entries, expired ones included, by
+        scanning the table.
+        """
+        buf = self.shm.buf
+        return sum(buf[self._offset(slot) + 8] & USED
+                   for slot in range(self.sets * self.ways))
+
+    def close(self):
+        """
+        Detach this process from the shared block.
+        """
+        self.shm.close()
+
+    def unlink(self):
+        """
+        Destroy the shared block once every process has closed it.
+        """
+        self.shm.unlink()
+
+    @staticmethod
+    def _hash(key):
+        """
+        Return a 64-bit hash of a key that is stable across processes.
+        """
+        digest = hashlib.blake2b(pickle.dumps(key, pickle.HIGHEST_PROTOCOL),
+                                 digest_size=8).digest()
+        return int.from_bytes(digest, "little")
+
+    def _offset(self, slot):
+        """
+        Return the offset of a slot in the shared block.
+        """
+        return self._table_at + slot * self.slot_size
+
+    def _read(self, offset):
+        """
+        Return the unpickled (key, item) pair of the slot at an offset.
+        """
+        buf = self.shm.buf
+        length = SLOT_HEADER.unpack_from(buf, offset)[2]
+        start = offset + SLOT_HEADER.size
+        with buf[start:start + length] as payload:
+            return pickle.loads(payload)
+
+    def _find(self, index, key_hash, key):
+        """
+        Return the slot of a key in a set, or None if it is not cached.
+        """
+        first = index * self.ways
+        buf = self.shm.buf
+        for slot in range(first, first + self.ways):
+            offset = self._offset(slot)
+            slot_hash, flags = SLOT_HEADER.unpack_from(buf, offset)[:2]
+            if flags & USED and slot_hash == key_hash and \
+                    self._read(offset)[0] == key:
+                return slot
+        return None
+
+    def _free_slot(self, index):
+        """
+        Return an unused slot of a set, evicting one with CLOCK if needed.
+        """
+        first = index * self.ways
+        buf = self.shm.buf
+        for slot in range(first, first + self.ways):
+            if not buf[self._offset(slot) + 8] & USED:
+                return slot
+        hand_offset = self._hands_at + index
+        hand = buf[hand_offset]
+        while True:
+            slot = first + hand % self.ways
+            hand = (hand + 1) % self.ways
+            flags_offset = self._offset(slot) + 8
+            if buf[flags_offset] & REFERENCED:
+                buf[flags_offset] &= ~REFERENCED & 0xFF
+            else:
+                buf[hand_offset] = hand
+                return slot
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""A two-tier caching module.
+
+This module defines a `TieredCache` class that puts an in-memory cache of
+any policy (L1) in front of a SQLite file on local disk (L2). Items the L1
+policy evicts for lack of room are demoted to L2 instead of being lost, and
+an L2 hit promotes the item back into L1. L2 is bounded by its own item
+count and drops its least recently demoted or read rows first.
+
+Keys and values are pickled into L2, so equal keys must pickle to equal
+bytes, as str, int and tuples of them do. Like the caches it combines, a
+tiered cache is not thread-safe by itself.
+
+Attributes:
+    l1 (BaseCaching): The in-memory tier.
+    db (sqlite3.Connection): The on-disk tier.
+"""
+
+import pickle
+import sqlite3
+import time
+
+from cache_stats import LatencyHistogram
+
+
+class TieredCache:
+    """
+    An in-memory cache backed by a disk tier for the items it evicts.
+    """
+
+    def __init__(self, l1, path, l2_max_items=100_000):
+        """
+        Initialize the tiered cache.
+
+        Args:
+            l1 (BaseCaching): The in-memory cache; its eviction callback is
+            chained so that capacity evictions are demoted.
+            path (str): The SQLite file holding L2. Rows left by a previous
+            process are reused.
+            l2_max_items (int): Maximum number of items kept in L2.
+        """
+        self.l1 = l1
+        self.l2_max_items = l2_max_items
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=OFF")
+        self.db.execute("CREATE TABLE IF NOT EXISTS l2 ("
+                        "key BLOB PRIMARY KEY, item BLOB NOT NULL, "
+                        "expires REAL, used INTEGER NOT NULL)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS l2_used ON l2 (used)")
+        self._used = self.db.execute(
+            "SELECT COALESCE(MAX(used), 0) FROM l2").fetchone()[0]
+        self._l2_size = self.db.execute(
+            "SELECT COUNT(*) FROM l2").fetchone()[0]
+        self._next_on_evict = l1.on_evict
+        l1.on_evict = self._on_evict
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.demotions = 0
+        self.latency = {"l1": LatencyHistogram(), "l2": LatencyHistogram()}
+
+    def put(self, key, item, ttl=None):
+        """
+        Add an item to L1, dropping any older copy from L2.
+
+        Args:
+            key: The key for the cache entry.
+            item: The value to be stored in the cache.
+            ttl (float): Seconds the entry lives; defaults to the L1
+            cache's default_ttl.
+        """
+        if key is None or item is None:
+            return
+        self._l2_delete(pickle.dumps(key, pickle.HIGHEST_PROTOCOL))
+        self.l1.put(key, item, ttl)
+
+    def get(self, key):
+        """
+        Retrieve an item from L1, or from L2 promoting it into L1.
+
+        Args:
+            key: The key to look up in the cache.
+
+        Returns:
+            The value associated with the key, or None if not found or
+            expired.
+        """
+        if key is None:
+            return None
+        start = time.perf_counter_ns()
+        item = self.l1.get(key)
+        self.latency["l1"].record(time.perf_counter_ns() - start)
+        if item is not None:
+            self.l1_hits += 1
+            return item
+        start = time.perf_counter_ns()
+        item, ttl = self._l2_take(key)
+        self.latency["l2"].record(time.perf_counter_ns() - start)
+        if item is None:
+            self.misses += 1
+            return None
+        self.l2_hits += 1
+        self.l1.put(key, item, ttl)
+        return item
+
+    def get_stats(self):
+        """
+        Return the hit rate and latency of each tier.
+
+        Returns:
+            dict: Hits, hit rates, demotions, L2 size and latencies.
+        """
+        lookups = self.l1_hits + self.l2_hits + self.misses
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "l1_hit_rate": self.l1_hits / lookups if lookups else 0.0,
+            "l2_hit_rate": self.l2_hits / lookups if lookups else 0.0,
+            "demotions": self.demotions,
+            "l2_items": self._l2_size,
+            "latency": {tier: histogram.as_dict()
+                        for tier, histogram in self.latency.items()},
+        }
+
+    def close(self):
+        """
+        Close the L2 database; the L1 cache is left as is.
+        """
+        self.l1.on_evict = self._next_on_evict
+        self.db.close()
+
+    def _on_evict(self, key, reason):
+        """
+        Demote an item L1 evicts for lack of room, then chain the callback.
+        """
+        if reason == "capacity":
+            self._demote(key, self.l1.cache_data[key],
+                         self.l1._expires.get(key))
+        if self._next_on_evict is not None:
+            self._next_on_evict(key, reason)
+
+    def _demote(self, key, item, deadline):
+        """
+        Write an item evicted from L1 to L2, trimming L2 if it is full.
+        """
+        expires = None
+        if deadline is not None:
+            expires = time.time() + deadline - self.l1.clock()
+        blob = pickle.dumps(key, pickle.HIGHEST_PROTOCOL)
+        self._l2_delete(blob)
+        self._used += 1
+        self.db.execute(
+            "INSERT INTO l2 (key, item, expires, used) VALUES (?, ?, ?, ?)",
+            (blob, pickle.dumps(item, pickle.HIGHEST_PROTOCOL), expires,
+             self._used))
+        self._l2_size += 1
+        self.demotions += 1
+        if self._l2_size > self.l2_max_items:
+            excess = self._l2_size - self.l2_max_items
+            self.db.execute("DELETE FROM l2 WHERE key IN (SELECT key FROM l2 "
+                            "ORDER BY used LIMIT ?)", (excess,))
+            self._l2_size -= excess
+
+    def _l2_take(self, key):
+        """
+        Remove an unexpired item from L2 and return it with its ttl.
+        """
+        blob = pickle.dumps(key, pickle.HIGHEST_PROTOCOL)
+        row = self.db.execute("SELECT item, expires FROM l2 WHERE key = ?",
+                              (blob,)).fetchone()
+        if row is None:
+            return None, None
+        self._l2_delete(blob)
+        item, expires = row
+        ttl = None
+        if expires is not None:
+            ttl = expires - time.time()
+            if ttl <= 0:
+                return None, None
+        return pickle.loads(item), ttl
+
+    def _l2_delete(self, blob):
+        """
+        Delete the L2 row of a pickled key, if any.
+        """
+        if self.db.execute("DELETE FROM l2 WHERE key = ?",
+                           (blob,)).rowcount:
+            self._l2_size -= 1
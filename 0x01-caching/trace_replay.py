@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Trace-replay harness reporting the hit ratio of every caching policy.
+
+Each trace is a list of keys. Replaying it reads every key with `get` and
+`put`s it on a miss, the way callers use the caches. The synthetic traces
+cover the three access patterns that separate the policies:
+
+    zipf: a skewed, mostly stable working set
+    scan: the same working set, interrupted by long one-off scans
+    loop: a cycle slightly larger than the cache
+
+Usage:
+    ./trace_replay.py [capacity] [length]
+"""
+
+import bisect
+import itertools
+import random
+import sys
+
+POLICIES = {
+    '1-fifo_cache': 'FIFOCache',
+    '2-lifo_cache': 'LIFOCache',
+    '3-lru_cache': 'LRUCache',
+    '4-mru_cache': 'MRUCache',
+    '100-lfu_cache': 'LFUCache',
+    '101-arc_cache': 'ARCCache',
+    '102-tinylfu_cache': 'WTinyLFUCache',
+    '103-clock_cache': 'ClockCache',
+}
+
+
+def load_policies():
+    """Returns the policy classes keyed by class name."""
+    return {name: getattr(__import__(module), name)
+            for module, name in POLICIES.items()}
+
+
+def zipf_trace(length, keys, skew=0.99, seed=0):
+    """Returns `length` keys drawn from a Zipf distribution over `keys`."""
+    weights = itertools.accumulate(1 / rank ** skew
+                                   for rank in range(1, keys + 1))
+    cumulative = list(weights)
+    rand = random.Random(seed)
+    total = cumulative[-1]
+    return [bisect.bisect(cumulative, rand.random() * total)
+            for _ in range(length)]
+
+
+def scan_trace(length, keys, scan_length, every, seed=0):
+    """Returns a Zipf trace with a scan of fresh keys every `every` keys."""
+    trace = []
+    fresh = itertools.count(keys)
+    for start in range(0, length, every):
+        trace.extend(zipf_trace(min(every, length - start), keys,
+                                seed=seed + start))
+        trace.extend(next(fresh) for _ in range(scan_length))
+    return trace[:length]
+
+
+def loop_trace(length, keys):
+    """Returns `length` keys cycling over `keys` distinct keys."""
+    return [index % keys for index in range(length)]
+
+
+def replay(cache, trace):
+    """Returns the hit ratio of `cache` over `trace`."""
+    hits = 0
+    for key in trace:
+        if cache.get(key) is None:
+            cache.put(key, key)
+        else:
+            hits += 1
+    return hits / len(trace)
+
+
+def traces(capacity, length):
+    """Returns the synthetic traces keyed by name."""
+    return {
+        'zipf': zipf_trace(length, capacity * 10),
+        'scan': scan_trace(length, capacity * 10, capacity * 2,
+                           length // 10),
+        'loop': loop_trace(length, capacity + capacity // 4),
+    }
+
+
+if __name__ == "__main__":
+    capacity = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    workloads = traces(capacity, length)
+    print(f"capacity {capacity}, {length} accesses per trace")
+    print(f"{'policy':>14}" + "".join(f"{name:>8}" for name in workloads))
+    for name, policy in load_policies().items():
+        ratios = [replay(policy(max_items=capacity, on_evict=None), trace)
+                  for trace in workloads.values()]
+        print(f"{name:>14}" + "".join(f"{ratio:>8.1%}" for ratio in ratios))